@@ -4,6 +4,7 @@ API文档生成路由
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from starlette.requests import Request
 from fastapi.responses import Response, JSONResponse, FileResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
 from app.core.database import get_local_db
@@ -51,7 +52,18 @@ def generate_curl_example(config: InterfaceConfig, full_url: str, request_sample
     return curl_cmd
 
 
-async def get_full_interface_doc(
+def _load_database_configs(db: Session, configs: List[InterfaceConfig]) -> Dict[int, DatabaseConfig]:
+    """一次IN查询取回多个接口所属的数据库配置，避免逐个接口查询DatabaseConfig（N+1）"""
+    ids = {config.database_config_id for config in configs if config.database_config_id}
+    if not ids:
+        return {}
+    return {
+        db_config.id: db_config
+        for db_config in db.query(DatabaseConfig).filter(DatabaseConfig.id.in_(ids)).all()
+    }
+
+
+def get_full_interface_doc(
     config: InterfaceConfig,
     db_config: DatabaseConfig,
     request: Request,
@@ -267,7 +279,7 @@ async def get_full_interface_doc(
 
 
 @router.get("/interfaces", response_model=ResponseModel)
-async def list_interface_docs(
+def list_interface_docs(
     page: Optional[int] = Query(1, ge=1, description="页码"),
     page_size: Optional[int] = Query(10, ge=1, le=100, description="每页数量"),
     current_user: User = Depends(get_current_active_user),
@@ -279,16 +291,17 @@ async def list_interface_docs(
             InterfaceConfig.user_id == current_user.id
         )
         
-        # 获取总数
-        total = query.count()
+        # 获取总数（直接COUNT，不包一层子查询）
+        total = query.with_entities(func.count(InterfaceConfig.id)).scalar() or 0
         
         # 分页
         offset = (page - 1) * page_size
         configs = query.order_by(InterfaceConfig.created_at.desc()).offset(offset).limit(page_size).all()
         
+        db_configs = _load_database_configs(db, configs)
         docs_list = []
         for config in configs:
-            db_config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config.database_config_id).first()
+            db_config = db_configs.get(config.database_config_id)
             
             # 生成基础文档信息
             doc_info = {
@@ -325,7 +338,7 @@ async def list_interface_docs(
 
 
 @router.get("/interfaces/{config_id}", response_model=ResponseModel)
-async def get_interface_doc(
+def get_interface_doc(
     config_id: int,
     request: Request,
     current_user: User = Depends(get_current_active_user),
@@ -342,7 +355,7 @@ async def get_interface_doc(
             raise HTTPException(status_code=404, detail="接口配置不存在")
         
         db_config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config.database_config_id).first()
-        doc = await get_full_interface_doc(config, db_config, request, current_user, db)
+        doc = get_full_interface_doc(config, db_config, request, current_user, db)
         
         return ResponseModel(
             success=True,
@@ -360,7 +373,7 @@ async def get_interface_doc(
 
 
 @router.post("/generate-all", response_model=ResponseModel)
-async def generate_all_docs(
+def generate_all_docs(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_local_db)
 ):
@@ -385,7 +398,7 @@ async def generate_all_docs(
 
 
 @router.get("/export/markdown")
-async def export_markdown(
+def export_markdown(
     interface_id: Optional[int] = Query(None, description="接口ID，不传则导出所有"),
     request: Request = None,
     current_user: User = Depends(get_current_active_user),
@@ -405,9 +418,10 @@ async def export_markdown(
         
         content = f"# API接口文档\n\n生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
         
+        db_configs = _load_database_configs(db, configs)
         for config in configs:
-            db_config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config.database_config_id).first()
-            doc = await get_full_interface_doc(config, db_config, request, current_user, db)
+            db_config = db_configs.get(config.database_config_id)
+            doc = get_full_interface_doc(config, db_config, request, current_user, db)
             
             content += f"## {doc['interface_name']}\n\n"
             content += f"**请求方式:** `{doc['http_method']}`\n\n"
@@ -486,7 +500,7 @@ async def export_markdown(
 
 
 @router.get("/export/html")
-async def export_html(
+def export_html(
     interface_id: Optional[int] = Query(None, description="接口ID，不传则导出所有"),
     request: Request = None,
     current_user: User = Depends(get_current_active_user),
@@ -531,9 +545,10 @@ async def export_html(
     <p>生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
 """
         
+        db_configs = _load_database_configs(db, configs)
         for config in configs:
-            db_config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config.database_config_id).first()
-            doc = await get_full_interface_doc(config, db_config, request, current_user, db)
+            db_config = db_configs.get(config.database_config_id)
+            doc = get_full_interface_doc(config, db_config, request, current_user, db)
             
             html_content += f"""
     <div class="interface">
@@ -662,7 +677,7 @@ async def export_html(
 
 
 @router.get("/export/openapi")
-async def export_openapi(
+def export_openapi(
     interface_id: Optional[int] = Query(None, description="接口ID，不传则导出所有"),
     request: Request = None,
     current_user: User = Depends(get_current_active_user),
@@ -709,9 +724,10 @@ async def export_openapi(
             "paths": {}
         }
         
+        db_configs = _load_database_configs(db, configs)
         for config in configs:
-            db_config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config.database_config_id).first()
-            doc = await get_full_interface_doc(config, db_config, request, current_user, db)
+            db_config = db_configs.get(config.database_config_id)
+            doc = get_full_interface_doc(config, db_config, request, current_user, db)
             
             path = doc['proxy_path']
             method = doc['http_method'].lower()
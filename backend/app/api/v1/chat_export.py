@@ -14,6 +14,7 @@ import json
 import csv
 from datetime import datetime
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from app.core.database import get_local_db
 from app.models import User, ChatMessage, ChatSession, DatabaseConfig, InterfaceConfig
@@ -719,7 +720,9 @@ async def generate_interface_from_message(
                     }
             
             mock_request = MockRequest()
-            api_doc = await get_full_interface_doc(
+            # 文档生成包含同步数据库查询并会执行一次接口SQL，放入线程池执行避免阻塞事件循环
+            api_doc = await run_in_threadpool(
+                get_full_interface_doc,
                 interface_config,
                 db_config,
                 mock_request,
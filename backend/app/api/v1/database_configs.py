@@ -10,10 +10,13 @@ from app.models import User, DatabaseConfig
 from app.schemas import ResponseModel
 from app.core.security import get_current_active_user
 from app.core.db_factory import DatabaseConnectionFactory
+from app.api.v1.interface_executor import invalidate_exec_context
+from app.api.v1.table_configs import invalidate_table_configs_cache
 from app.core.sql_dialect import SQLDialectFactory
 from app.core.password_encryption import encrypt_password, decrypt_password, is_encrypted
 from loguru import logger
-from sqlalchemy import text, inspect
+from sqlalchemy import text, inspect, insert
+from sqlalchemy.exc import NoResultFound
 
 
 def get_client_ip(request: Request) -> str:
@@ -121,10 +124,7 @@ async def get_config(
             DatabaseConfig.id == config_id,
             DatabaseConfig.user_id == current_user.id,
             DatabaseConfig.is_deleted == False
-        ).first()
-        
-        if not config:
-            raise HTTPException(status_code=404, detail="数据库配置不存在")
+        ).one()
         
         # 密码遮掩显示
         password_display = "******" if config.password else ""
@@ -150,7 +150,7 @@ async def get_config(
             message="获取成功",
             data=result
         )
-    except HTTPException:
+    except (HTTPException, NoResultFound):
         raise
     except Exception as e:
         logger.error("获取数据库配置详情失败: {}", e, exc_info=True)
@@ -178,7 +178,9 @@ async def create_config(
         database = config_data.get("database", "").strip() if config_data.get("database") else ""
         username = config_data.get("username", "").strip() if config_data.get("username") else ""
         
-        config = DatabaseConfig(
+        # 直接执行INSERT并取回主键（PostgreSQL使用RETURNING，MySQL使用lastrowid），
+        # 响应只需要id，因此无需再refresh重新查询整行
+        stmt = insert(DatabaseConfig).values(
             user_id=current_user.id,
             name=config_data.get("name"),
             db_type=config_data.get("db_type", "mysql"),  # 支持新字段，默认mysql
@@ -191,15 +193,13 @@ async def create_config(
             extra_params=config_data.get("extra_params"),  # 支持新字段
             is_active=config_data.get("is_active", True)
         )
-        
-        db.add(config)
+        new_id = db.execute(stmt).inserted_primary_key[0]
         db.commit()
-        db.refresh(config)
         
         return ResponseModel(
             success=True,
             message="创建成功",
-            data={"id": config.id}
+            data={"id": new_id}
         )
     except Exception as e:
         db.rollback()
@@ -223,10 +223,7 @@ async def update_config(
             DatabaseConfig.id == config_id,
             DatabaseConfig.user_id == current_user.id,
             DatabaseConfig.is_deleted == False
-        ).first()
-        
-        if not config:
-            raise HTTPException(status_code=404, detail="数据库配置不存在")
+        ).one()
         
         # 更新字段
         for key, value in config_data.items():
@@ -242,13 +239,15 @@ async def update_config(
         
         db.commit()
         db.refresh(config)
+        invalidate_exec_context(database_config_id=config_id)
+        await invalidate_table_configs_cache(current_user.id)
         
         return ResponseModel(
             success=True,
             message="更新成功",
             data={"id": config.id}
         )
-    except HTTPException:
+    except (HTTPException, NoResultFound):
         raise
     except Exception as e:
         db.rollback()
@@ -271,10 +270,7 @@ async def delete_config(
             DatabaseConfig.id == config_id,
             DatabaseConfig.user_id == current_user.id,
             DatabaseConfig.is_deleted == False
-        ).first()
-        
-        if not config:
-            raise HTTPException(status_code=404, detail="数据库配置不存在")
+        ).one()
         
         if config.is_deleted:
             raise HTTPException(status_code=404, detail="数据库配置已被删除")
@@ -282,12 +278,14 @@ async def delete_config(
         # 软删除
         config.is_deleted = True
         db.commit()
+        invalidate_exec_context(database_config_id=config_id)
+        await invalidate_table_configs_cache(current_user.id)
         
         return ResponseModel(
             success=True,
             message="删除成功"
         )
-    except HTTPException:
+    except (HTTPException, NoResultFound):
         raise
     except Exception as e:
         db.rollback()
@@ -351,13 +349,8 @@ async def test_connection_direct(
         )
         
         try:
-            # 使用工厂创建引擎
-            engine = DatabaseConnectionFactory.create_engine(temp_config)
-            # 获取测试SQL
-            test_sql = DatabaseConnectionFactory.get_test_sql(db_type)
-            with engine.connect() as conn:
-                conn.execute(text(test_sql))
-            engine.dispose()
+            # 使用工厂异步测试连接（MySQL使用asyncmy，其他类型在线程池中执行）
+            await DatabaseConnectionFactory.test_connection_async(temp_config)
             
             # 注意：这是直接测试连接，不需要保存配置到数据库
             # 如果测试成功，直接返回成功消息即可
@@ -423,10 +416,7 @@ async def test_connection(
             DatabaseConfig.id == config_id,
             DatabaseConfig.user_id == current_user.id,
             DatabaseConfig.is_deleted == False
-        ).first()
-        
-        if not config:
-            raise HTTPException(status_code=404, detail="数据库配置不存在")
+        ).one()
         
         db_type = config.db_type or "mysql"
         
@@ -434,13 +424,8 @@ async def test_connection(
         logger.info(f"用户 {current_user.id} 测试数据库配置 {config_id} ({config.name}, {db_type})")
         
         try:
-            # 使用工厂创建引擎
-            engine = DatabaseConnectionFactory.create_engine(config)
-            # 获取测试SQL
-            test_sql = DatabaseConnectionFactory.get_test_sql(db_type)
-            with engine.connect() as conn:
-                conn.execute(text(test_sql))
-            engine.dispose()
+            # 使用工厂异步测试连接（MySQL使用asyncmy，其他类型在线程池中执行）
+            await DatabaseConnectionFactory.test_connection_async(config)
             
             # 测试成功后，自动将配置设置为已激活
             config.is_active = True
@@ -483,7 +468,7 @@ async def test_connection(
                 status_code=400,
                 detail=detail_msg
             )
-    except HTTPException:
+    except (HTTPException, NoResultFound):
         raise
     except Exception as e:
         # 安全：记录错误时不包含密码信息
@@ -507,10 +492,7 @@ async def list_tables(
             DatabaseConfig.id == config_id,
             DatabaseConfig.user_id == current_user.id,
             DatabaseConfig.is_deleted == False
-        ).first()
-        
-        if not config:
-            raise HTTPException(status_code=404, detail="数据库配置不存在")
+        ).one()
         
         db_type = config.db_type or "mysql"
         adapter = SQLDialectFactory.get_adapter(db_type)
@@ -713,7 +695,7 @@ async def list_tables(
                 status_code=400,
                 detail=detail_msg
             )
-    except HTTPException:
+    except (HTTPException, NoResultFound):
         raise
     except Exception as e:
         logger.error("获取表列表失败: {}", e, exc_info=True)
@@ -737,10 +719,7 @@ async def get_table_sample(
             DatabaseConfig.id == config_id,
             DatabaseConfig.user_id == current_user.id,
             DatabaseConfig.is_deleted == False
-        ).first()
-        
-        if not config:
-            raise HTTPException(status_code=404, detail="数据库配置不存在")
+        ).one()
         
         db_type = config.db_type or "mysql"
         
@@ -818,7 +797,7 @@ async def get_table_sample(
                 status_code=400,
                 detail=f"获取示例数据失败: {str(e)}"
             )
-    except HTTPException:
+    except (HTTPException, NoResultFound):
         raise
     except Exception as e:
         logger.error("获取示例数据失败: {}", e, exc_info=True)
@@ -925,18 +904,19 @@ async def get_table_info(
                         raise HTTPException(status_code=400, detail=f"获取SQLite表信息失败: {str(e)}")
                 
                 # 其他数据库使用inspect
-                inspector = inspect(engine)
+                # 绑定到当前连接而非engine，使表名、列、主键和注释查询复用同一个连接，
+                # 避免每次inspector调用都从连接池重新检出连接
+                inspector = inspect(conn)
                 
                 # 先验证表是否存在
                 try:
                     if db_type == "postgresql":
                         existing_tables = inspector.get_table_names(schema='public')
                     elif db_type == "sqlite":
-                        with engine.connect() as conn:
-                            result = conn.execute(text(
-                                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-                            ))
-                            existing_tables = [row[0] for row in result]
+                        result = conn.execute(text(
+                            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+                        ))
+                        existing_tables = [row[0] for row in result]
                     else:
                         existing_tables = inspector.get_table_names()
                     
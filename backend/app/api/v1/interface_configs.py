@@ -1,44 +1,134 @@
 """
 接口配置路由
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from starlette.requests import Request
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select, update
 from typing import Optional, List, Dict, Any
-from app.core.database import get_local_db
+from app.core.database import get_async_local_db
+from app.core.config import settings
 from app.models import User, InterfaceConfig, InterfaceParameter, InterfaceHeader, DatabaseConfig
 from app.schemas import ResponseModel
 from app.core.security import get_current_active_user
+from app.api.v1.interface_executor import execute_interface_sql, invalidate_exec_context
+from app.api.v1.table_configs import invalidate_table_configs_cache
 from loguru import logger
 import sqlparse
 from sqlparse.sql import Statement, IdentifierList, Identifier
 from sqlparse.tokens import Keyword, DML
 import json
+import re
+import hashlib
+from functools import lru_cache
+
+try:
+    import sqlglot
+    from sqlglot import exp as sqlglot_exp
+    SQLGLOT_AVAILABLE = True
+except ImportError:
+    SQLGLOT_AVAILABLE = False
+    logger.debug("sqlglot未安装，SQL响应字段解析使用sqlparse")
 
 router = APIRouter(prefix="/api/v1/interface-configs", tags=["接口配置"])
 
+# SQL命名参数占位符（:param_name）
+_PARAM_PATTERN = re.compile(r':(\w+)')
+# 明确不返回结果集的语句开头；以注释、括号等开头的SQL仍交给解析器判断
+_NON_QUERY_PATTERN = re.compile(
+    r'\s*(INSERT|UPDATE|DELETE|MERGE|REPLACE|CREATE|ALTER|DROP|TRUNCATE|GRANT|REVOKE)\b',
+    re.IGNORECASE
+)
+# 创建接口配置时未提供字段的默认值（未列出的字段默认为None）
+_CREATE_DEFAULTS = {
+    "status": "draft",
+    "entry_mode": "expert",
+    "sync_to_gateway": False,
+    "http_method": "GET",
+    "proxy_schemes": "http",
+    "request_format": "application/json",
+    "response_format": "application/json",
+    "associate_plugin": False,
+    "is_options_request": False,
+    "is_head_request": False,
+    "define_date_format": False,
+    "return_total_count": False,
+    "enable_pagination": False,
+    "max_query_count": 10,
+    "enable_rate_limit": False,
+    "timeout_seconds": 10,
+    "proxy_auth": "no_auth",
+    "encryption_method": "no_encryption",
+    "enable_replay_protection": False,
+    "enable_whitelist": False,
+    "whitelist_ips": "",
+    "enable_blacklist": False,
+    "blacklist_ips": "",
+    "enable_audit_log": False,
+    "enable_cors": False,
+    "cors_allow_origin": "",
+    "cors_expose_headers": "",
+    "cors_allow_methods": "",
+    "cors_allow_headers": "",
+    "cors_allow_credentials": True,
+}
+# 创建接口配置时从请求数据中读取的字段
+_CREATE_FIELDS = (
+    "database_config_id", "interface_name", "interface_description",
+    "usage_instructions", "category", "status", "entry_mode", "sql_statement",
+    "table_name", "selected_fields", "where_conditions", "order_by_fields",
+    "sync_to_gateway", "extension_fields", "http_method", "proxy_schemes", "proxy_path",
+    "request_format", "response_format", "associate_plugin", "is_options_request",
+    "is_head_request", "define_date_format", "return_total_count", "enable_pagination",
+    "max_query_count", "enable_rate_limit", "timeout_seconds", "proxy_auth",
+    "encryption_method", "enable_replay_protection", "enable_whitelist",
+    "whitelist_ips", "enable_blacklist", "blacklist_ips", "enable_audit_log",
+    "enable_cors", "cors_allow_origin", "cors_expose_headers", "cors_max_age",
+    "cors_allow_methods", "cors_allow_headers", "cors_allow_credentials",
+)
+# 样例数据：按参数类型取样例值，未知类型使用默认样例值
+_SAMPLE_VALUES = {"integer": 1, "number": 1.0, "boolean": True}
+_DEFAULT_SAMPLE = "示例值"
+# 分页参数的样例值
+_PAGINATION_SAMPLE = {"pageNumber": 1, "pageSize": 10}
+# 响应样例中不随配置变化的部分，按需浅拷贝后再填充
+_RESPONSE_SAMPLE_DATA = {"data": [], "count": 0, "pageNumber": 1, "pageSize": 10}
+# 更新接口配置时允许直接赋值的列
+_UPDATABLE_FIELDS = frozenset(InterfaceConfig.__table__.columns.keys()) - {
+    "id", "user_id", "created_at", "updated_at", "is_deleted"
+}
+
 
 def parse_sql_parameters(sql: str) -> Dict[str, Any]:
     """
     解析SQL语句中的参数
     返回请求参数和响应参数
+    
+    解析结果按SQL文本缓存；调用方可能会向列表中追加分页等参数，
+    因此每次返回缓存结果的副本
+    """
+    parsed = _parse_sql_parameters_cached(sql)
+    return {
+        "request_parameters": [dict(p) for p in parsed["request_parameters"]],
+        "response_parameters": [dict(p) for p in parsed["response_parameters"]]
+    }
+
+
+@lru_cache(maxsize=1024)
+def _parse_sql_parameters_cached(sql: str) -> Dict[str, Any]:
+    """
+    解析SQL语句中的参数（按SQL文本缓存，SQL变更后自然使用新的缓存键）
     """
     try:
-        parsed = sqlparse.parse(sql)
-        if not parsed:
-            return {"request_parameters": [], "response_parameters": []}
-        
         request_params = []
         response_params = []
         
         # 简单的参数提取：查找 :param_name 格式的参数
-        import re
-        param_pattern = r':(\w+)'
-        params = re.findall(param_pattern, sql)
+        params = _PARAM_PATTERN.findall(sql)
         
-        # 去重并创建参数列表
-        unique_params = list(set(params))
-        for param_name in unique_params:
+        # 去重（保持参数在SQL中出现的顺序）并创建参数列表
+        for param_name in dict.fromkeys(params):
             request_params.append({
                 "name": param_name,
                 "type": "string",
@@ -47,47 +137,21 @@ def parse_sql_parameters(sql: str) -> Dict[str, Any]:
                 "location": "query"
             })
         
+        # 明确的非查询语句没有响应字段，无需调用开销较大的SQL解析
+        if _NON_QUERY_PATTERN.match(sql):
+            return {
+                "request_parameters": request_params,
+                "response_parameters": response_params
+            }
+        
         # 尝试从SELECT语句中提取响应字段
-        for stmt in parsed:
-            if stmt.get_type() == 'SELECT':
-                # 查找SELECT后的字段列表
-                tokens = stmt.tokens
-                in_select = False
-                select_fields_found = False
-                for token in tokens:
-                    if token.ttype is DML and token.value.upper() == 'SELECT':
-                        in_select = True
-                        continue
-                    if in_select:
-                        # 检查是否是SELECT *
-                        if isinstance(token, sqlparse.sql.Token) and token.value.strip() == '*':
-                            # SELECT * 的情况，无法从SQL中提取字段，返回空列表
-                            # 字段信息需要从实际执行结果或表结构中获取
-                            break
-                        elif isinstance(token, IdentifierList):
-                            # SELECT field1, field2, ... 的情况
-                            for identifier in token.get_identifiers():
-                                if isinstance(identifier, Identifier):
-                                    field_name = identifier.get_real_name()
-                                    response_params.append({
-                                        "name": field_name,
-                                        "type": "string",
-                                        "description": f"字段 {field_name}",
-                                        "constraint": "required"
-                                    })
-                            select_fields_found = True
-                            break
-                        elif isinstance(token, Identifier):
-                            # SELECT field 的情况（单个字段）
-                            field_name = token.get_real_name()
-                            response_params.append({
-                                "name": field_name,
-                                "type": "string",
-                                "description": f"字段 {field_name}",
-                                "constraint": "required"
-                            })
-                            select_fields_found = True
-                            break
+        for field_name in _extract_select_fields(sql):
+            response_params.append({
+                "name": field_name,
+                "type": "string",
+                "description": f"字段 {field_name}",
+                "constraint": "required"
+            })
         
         return {
             "request_parameters": request_params,
@@ -98,11 +162,125 @@ def parse_sql_parameters(sql: str) -> Dict[str, Any]:
         return {"request_parameters": [], "response_parameters": []}
 
 
+def _build_etag(config: InterfaceConfig, *extra: Any) -> str:
+    """
+    根据接口配置的更新时间生成弱ETag（update_config会刷新updated_at，ETag随之失效）
+    
+    extra为响应内容依赖的其他值（如数据库配置的更新时间、请求主机名）
+    """
+    parts = [config.id, config.updated_at.timestamp() if config.updated_at else 0, *extra]
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """检查请求的If-None-Match是否与ETag匹配"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified_or_tag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """客户端缓存仍有效时返回304响应；否则在响应上设置ETag并返回None"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def _extract_select_fields(sql: str) -> List[str]:
+    """
+    提取SELECT语句的字段名，SELECT * 返回空列表
+    
+    优先使用sqlglot解析（字段有别名时取别名，与查询结果的列名一致）；
+    sqlglot未安装或无法解析时回退到sqlparse
+    """
+    if SQLGLOT_AVAILABLE:
+        try:
+            expression = sqlglot.parse_one(sql, read="mysql")
+        except sqlglot.errors.SqlglotError:
+            expression = None
+        if isinstance(expression, sqlglot_exp.Query):
+            fields = []
+            for projection in expression.selects:
+                if projection.is_star:
+                    # SELECT * 的情况，字段信息需要从实际执行结果或表结构中获取
+                    return []
+                if isinstance(projection, (sqlglot_exp.Column, sqlglot_exp.Alias)):
+                    fields.append(projection.alias_or_name)
+            return fields
+    return _extract_select_fields_sqlparse(sql)
+
+
+def _extract_select_fields_sqlparse(sql: str) -> List[str]:
+    """使用sqlparse提取SELECT语句的字段名"""
+    fields = []
+    for stmt in sqlparse.parse(sql):
+        if stmt.get_type() == 'SELECT':
+            # 查找SELECT后的字段列表
+            in_select = False
+            for token in stmt.tokens:
+                if token.ttype is DML and token.value.upper() == 'SELECT':
+                    in_select = True
+                    continue
+                if in_select:
+                    # 检查是否是SELECT *
+                    if isinstance(token, sqlparse.sql.Token) and token.value.strip() == '*':
+                        # SELECT * 的情况，无法从SQL中提取字段，返回空列表
+                        break
+                    elif isinstance(token, IdentifierList):
+                        # SELECT field1, field2, ... 的情况
+                        for identifier in token.get_identifiers():
+                            if isinstance(identifier, Identifier):
+                                fields.append(identifier.get_real_name())
+                        break
+                    elif isinstance(token, Identifier):
+                        # SELECT field 的情况（单个字段）
+                        fields.append(token.get_real_name())
+                        break
+    return fields
+
+
+def _extract_request_parameters(config: InterfaceConfig) -> List[Dict[str, Any]]:
+    """
+    从接口配置中提取请求参数（专家模式解析SQL，图形模式取WHERE条件中的变量）
+    """
+    if config.entry_mode == "expert" and config.sql_statement:
+        return parse_sql_parameters(config.sql_statement)["request_parameters"]
+    
+    request_parameters = []
+    if config.entry_mode == "graphical" and config.where_conditions:
+        for cond in config.where_conditions:
+            if cond.get("value_type") == "variable" and cond.get("variable_name"):
+                request_parameters.append({
+                    "name": cond.get("variable_name"),
+                    "type": "string",
+                    "description": cond.get("description", ""),
+                    "constraint": "required" if cond.get("required", True) else "optional",
+                    "location": "query"
+                })
+    return request_parameters
+
+
+def _build_request_sample(request_parameters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """根据请求参数生成请求样例（分页参数使用默认值，其余按参数类型取样例值）"""
+    return {
+        param["name"]: _PAGINATION_SAMPLE.get(
+            param["name"],
+            _SAMPLE_VALUES.get(param.get("type", "string"), _DEFAULT_SAMPLE)
+        )
+        for param in request_parameters
+    }
+
+
 @router.post("/parse-sql", response_model=ResponseModel)
 async def parse_sql(
     sql_data: Dict[str, str],
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """解析SQL语句，提取参数"""
     try:
@@ -133,53 +311,75 @@ async def list_configs(
     page: Optional[int] = Query(1, ge=1, description="页码"),
     page_size: Optional[int] = Query(10, ge=1, le=1000, description="每页数量"),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """获取接口配置列表（支持分页）"""
     try:
-        query = db.query(InterfaceConfig).filter(
+        # 通过LEFT JOIN一次性取回数据库配置名称，避免逐行查询DatabaseConfig（N+1）；
+        # 只查询列表展示需要的列，不加载SQL语句、JSON条件等大字段
+        stmt = select(
+            InterfaceConfig.id,
+            InterfaceConfig.interface_name,
+            InterfaceConfig.entry_mode,
+            InterfaceConfig.status,
+            InterfaceConfig.proxy_path,
+            InterfaceConfig.http_method,
+            InterfaceConfig.created_at,
+            InterfaceConfig.updated_at,
+            DatabaseConfig.name.label("database_name")
+        ).outerjoin(
+            DatabaseConfig,
+            and_(
+                DatabaseConfig.id == InterfaceConfig.database_config_id,
+                DatabaseConfig.is_deleted == False
+            )
+        ).where(
             InterfaceConfig.user_id == current_user.id,
             InterfaceConfig.is_deleted == False
         )
         
         if database_id:
-            query = query.filter(InterfaceConfig.database_config_id == database_id)
+            stmt = stmt.where(InterfaceConfig.database_config_id == database_id)
         
         if status:
-            query = query.filter(InterfaceConfig.status == status)
+            stmt = stmt.where(InterfaceConfig.status == status)
         
         if entry_mode:
-            query = query.filter(InterfaceConfig.entry_mode == entry_mode)
+            stmt = stmt.where(InterfaceConfig.entry_mode == entry_mode)
         
-        # 获取总数
-        total = query.count()
-        
-        # 分页
+        # 分页，总数通过窗口函数 COUNT(*) OVER() 随数据行一起返回，避免单独执行COUNT查询
         offset = (page - 1) * page_size
-        configs = query.order_by(InterfaceConfig.created_at.desc()).offset(offset).limit(page_size).all()
-        
-        result = []
-        for config in configs:
-            db_config = db.query(DatabaseConfig).filter(
-                DatabaseConfig.id == config.database_config_id,
-                DatabaseConfig.is_deleted == False
-            ).first()
-            result.append({
-                "id": config.id,
-                "interface_name": config.interface_name,
-                "database_name": db_config.name if db_config else "",
-                "entry_mode": config.entry_mode,
-                "status": config.status,
-                "proxy_path": config.proxy_path,
-                "http_method": config.http_method,
-                "created_at": config.created_at.isoformat() if config.created_at else None,
-                "updated_at": config.updated_at.isoformat() if config.updated_at else None
-            })
+        rows = (await db.execute(
+            stmt.add_columns(
+                func.count().over().label("total")
+            ).order_by(InterfaceConfig.created_at.desc()).offset(offset).limit(page_size)
+        )).all()
+        
+        if rows:
+            total = rows[0].total
+        elif page > 1:
+            # 页码超出范围时当前页没有数据行，回退为单独的COUNT查询
+            total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+        else:
+            total = 0
         
         return ResponseModel(
             success=True,
             message="获取成功",
-            data=result,
+            data=[
+                {
+                    "id": row.id,
+                    "interface_name": row.interface_name,
+                    "database_name": row.database_name or "",
+                    "entry_mode": row.entry_mode,
+                    "status": row.status,
+                    "proxy_path": row.proxy_path,
+                    "http_method": row.http_method,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at
+                }
+                for row in rows
+            ],
             pagination={
                 "total": total,
                 "page": page,
@@ -198,38 +398,53 @@ async def list_configs(
 @router.get("/{config_id}", response_model=ResponseModel)
 async def get_config(
     config_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """获取接口配置详情"""
     try:
-        config = db.query(InterfaceConfig).filter(
-            InterfaceConfig.id == config_id,
-            InterfaceConfig.user_id == current_user.id,
-            InterfaceConfig.is_deleted == False
-        ).first()
-        
-        if not config:
+        # 通过LEFT JOIN一次查询同时取回接口配置及其数据库配置
+        row = (await db.execute(
+            select(InterfaceConfig, DatabaseConfig).outerjoin(
+                DatabaseConfig,
+                DatabaseConfig.id == InterfaceConfig.database_config_id
+            ).where(
+                InterfaceConfig.id == config_id,
+                InterfaceConfig.user_id == current_user.id,
+                InterfaceConfig.is_deleted == False
+            )
+        )).first()
+        
+        if not row:
             raise HTTPException(status_code=404, detail="接口配置不存在")
         
-        db_config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config.database_config_id).first()
+        config, db_config = row
+        
+        # 配置未变更时直接返回304，跳过参数解析、字段探测等后续处理
+        not_modified = _not_modified_or_tag(
+            request, response,
+            _build_etag(config, db_config.updated_at if db_config else None)
+        )
+        if not_modified:
+            return not_modified
         
         # 获取请求参数和响应参数
-        request_parameters = []
+        request_parameters = _extract_request_parameters(config)
         response_parameters = []
         
         if config.entry_mode == "expert" and config.sql_statement:
-            # 专家模式：从SQL中解析参数
-            parsed = parse_sql_parameters(config.sql_statement)
-            request_parameters = parsed.get("request_parameters", [])
-            response_parameters = parsed.get("response_parameters", [])
+            # 专家模式：从SQL中解析响应字段
+            response_parameters = parse_sql_parameters(config.sql_statement)["response_parameters"]
             
             # 如果响应参数为空（例如SELECT *的情况），尝试从实际执行结果中获取
             if not response_parameters:
                 try:
-                    from app.api.v1.interface_executor import execute_interface_sql
                     # 执行一次查询获取字段信息（使用LIMIT 1避免大量数据）
-                    test_result = execute_interface_sql(
+                    # 目标库查询为同步实现，放入线程池执行避免阻塞事件循环
+                    test_result = await run_in_threadpool(
+                        execute_interface_sql,
                         config,
                         db_config,
                         {},  # 空参数
@@ -260,33 +475,21 @@ async def get_config(
                                 })
                 except Exception as e:
                     logger.warning(f"尝试从实际执行结果获取响应参数失败: {e}")
-        elif config.entry_mode == "graphical":
-            # 图形模式：从WHERE条件中提取请求参数
-            if config.where_conditions:
-                for cond in config.where_conditions:
-                    if cond.get("value_type") == "variable" and cond.get("variable_name"):
-                        request_parameters.append({
-                            "name": cond.get("variable_name"),
-                            "type": "string",
-                            "description": cond.get("description", ""),
-                            "constraint": "required" if cond.get("required", True) else "optional",
-                            "location": "query"
-                        })
+        elif config.entry_mode == "graphical" and config.selected_fields:
             # 图形模式：从selected_fields中提取响应参数（数据字段）
-            if config.selected_fields:
-                for field in config.selected_fields:
-                    response_parameters.append({
-                        "name": field,
-                        "type": "string",  # 默认类型，实际类型可以从数据库schema获取
-                        "description": f"字段 {field}",
-                        "constraint": "required"
-                    })
+            for field in config.selected_fields:
+                response_parameters.append({
+                    "name": field,
+                    "type": "string",  # 默认类型，实际类型可以从数据库schema获取
+                    "description": f"字段 {field}",
+                    "constraint": "required"
+                })
         
         # 获取保存的请求参数（从数据库）
-        saved_params = db.query(InterfaceParameter).filter(
+        saved_params = (await db.scalars(select(InterfaceParameter).where(
             InterfaceParameter.interface_config_id == config_id,
             InterfaceParameter.is_deleted == False
-        ).all()
+        ))).all()
         saved_request_parameters = []
         for param in saved_params:
             saved_request_parameters.append({
@@ -327,11 +530,11 @@ async def get_config(
         
         
         # 获取保存的响应头（从数据库）
-        saved_headers = db.query(InterfaceHeader).filter(
+        saved_headers = (await db.scalars(select(InterfaceHeader).where(
             InterfaceHeader.interface_config_id == config_id,
             InterfaceHeader.name.like("Response-%"),
             InterfaceHeader.is_deleted == False
-        ).all()
+        ))).all()
         response_headers_list = []
         for header in saved_headers:
             # 移除Response-前缀
@@ -394,8 +597,8 @@ async def get_config(
             "response_parameters": response_parameters,
             # 获取保存的响应头
             "response_headers": response_headers_list,
-            "created_at": config.created_at.isoformat() if config.created_at else None,
-            "updated_at": config.updated_at.isoformat() if config.updated_at else None
+            "created_at": config.created_at,
+            "updated_at": config.updated_at
         }
         
         return ResponseModel(
@@ -418,16 +621,16 @@ async def get_config(
 async def create_config(
     config_data: Dict[str, Any],
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """创建接口配置"""
     try:
         # 验证数据库配置是否存在
         database_config_id = config_data.get("database_config_id")
-        db_config = db.query(DatabaseConfig).filter(
+        db_config = await db.scalar(select(DatabaseConfig).where(
             DatabaseConfig.id == database_config_id,
             DatabaseConfig.user_id == current_user.id
-        ).first()
+        ))
         
         if not db_config:
             raise HTTPException(status_code=400, detail="数据库配置不存在")
@@ -445,63 +648,20 @@ async def create_config(
         # 创建接口配置
         config = InterfaceConfig(
             user_id=current_user.id,
-            database_config_id=config_data.get("database_config_id"),
-            interface_name=config_data.get("interface_name"),
-            interface_description=config_data.get("interface_description"),
-            usage_instructions=config_data.get("usage_instructions"),
-            category=config_data.get("category"),
-            status=config_data.get("status", "draft"),
-            entry_mode=config_data.get("entry_mode", "expert"),
-            sql_statement=config_data.get("sql_statement"),
-            table_name=config_data.get("table_name"),
-            selected_fields=config_data.get("selected_fields"),
-            where_conditions=config_data.get("where_conditions"),
-            order_by_fields=config_data.get("order_by_fields"),
-            sync_to_gateway=config_data.get("sync_to_gateway", False),
-            extension_fields=config_data.get("extension_fields"),
-            http_method=config_data.get("http_method", "GET"),
-            proxy_schemes=config_data.get("proxy_schemes", "http"),
-            proxy_path=config_data.get("proxy_path"),
-            request_format=config_data.get("request_format", "application/json"),
-            response_format=config_data.get("response_format", "application/json"),
-            associate_plugin=config_data.get("associate_plugin", False),
-            is_options_request=config_data.get("is_options_request", False),
-            is_head_request=config_data.get("is_head_request", False),
-            define_date_format=config_data.get("define_date_format", False),
-            return_total_count=config_data.get("return_total_count", False),
-            enable_pagination=config_data.get("enable_pagination", False),
-            max_query_count=config_data.get("max_query_count", 10),
-            enable_rate_limit=config_data.get("enable_rate_limit", False),
-            timeout_seconds=config_data.get("timeout_seconds", 10),
-            proxy_auth=config_data.get("proxy_auth", "no_auth"),
-            encryption_method=config_data.get("encryption_method", "no_encryption"),
-            enable_replay_protection=config_data.get("enable_replay_protection", False),
-            enable_whitelist=config_data.get("enable_whitelist", False),
-            whitelist_ips=config_data.get("whitelist_ips", ""),
-            enable_blacklist=config_data.get("enable_blacklist", False),
-            blacklist_ips=config_data.get("blacklist_ips", ""),
-            enable_audit_log=config_data.get("enable_audit_log", False),
-            # 跨域设置
-            enable_cors=config_data.get("enable_cors", False),
-            cors_allow_origin=config_data.get("cors_allow_origin", ""),
-            cors_expose_headers=config_data.get("cors_expose_headers", ""),
-            cors_max_age=config_data.get("cors_max_age"),
-            cors_allow_methods=config_data.get("cors_allow_methods", ""),
-            cors_allow_headers=config_data.get("cors_allow_headers", ""),
-            cors_allow_credentials=config_data.get("cors_allow_credentials", True)
+            **{key: config_data.get(key, _CREATE_DEFAULTS.get(key)) for key in _CREATE_FIELDS}
         )
         
         db.add(config)
-        db.flush()  # 先刷新以获取config.id
+        await db.flush()  # 先刷新以获取config.id
         
         # 处理请求参数（如果提供了）
         if "request_parameters" in config_data and isinstance(config_data["request_parameters"], list):
             # 先删除旧的参数
             # 软删除旧的参数
-            db.query(InterfaceParameter).filter(
+            await db.execute(update(InterfaceParameter).where(
                 InterfaceParameter.interface_config_id == config.id,
                 InterfaceParameter.is_deleted == False
-            ).update({"is_deleted": True}, synchronize_session=False)
+            ).values(is_deleted=True).execution_options(synchronize_session=False))
             # 创建新的参数
             for param_data in config_data["request_parameters"]:
                 if isinstance(param_data, dict) and param_data.get("name"):
@@ -523,11 +683,11 @@ async def create_config(
             try:
                 # 使用synchronize_session=False避免加载对象到会话
                 # 软删除旧的响应头
-                deleted_count = db.query(InterfaceHeader).filter(
+                await db.execute(update(InterfaceHeader).where(
                     InterfaceHeader.interface_config_id == config.id,
                     InterfaceHeader.name.like("Response-%"),  # 响应头使用Response-前缀
                     InterfaceHeader.is_deleted == False
-                ).update({"is_deleted": True}, synchronize_session=False)
+                ).values(is_deleted=True).execution_options(synchronize_session=False))
             except Exception as e:
                 # 如果删除失败（可能是表结构问题），记录日志但继续
                 logger.warning("删除旧响应头失败（可能不存在）: {}", e)
@@ -550,8 +710,9 @@ async def create_config(
                         logger.error("添加响应头失败: {}", e)
                         raise
         
-        db.commit()
-        db.refresh(config)
+        # flush时已获得自增主键，且会话提交后不过期对象，无需再refresh
+        await db.commit()
+        await invalidate_table_configs_cache(current_user.id)
         
         return ResponseModel(
             success=True,
@@ -561,7 +722,7 @@ async def create_config(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("创建接口配置失败: {}", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -574,33 +735,34 @@ async def update_config(
     config_id: int,
     config_data: Dict[str, Any],
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """更新接口配置"""
     try:
-        config = db.query(InterfaceConfig).filter(
+        config = await db.scalar(select(InterfaceConfig).where(
             InterfaceConfig.id == config_id,
             InterfaceConfig.user_id == current_user.id,
             InterfaceConfig.is_deleted == False
-        ).first()
+        ))
         
         if not config:
             raise HTTPException(status_code=404, detail="接口配置不存在")
         
-        # 更新字段（排除需要特殊处理的字段）
-        exclude_keys = {"request_parameters", "response_headers"}
+        # 更新字段（仅允许可编辑的列，请求参数和响应头单独处理）
         for key, value in config_data.items():
-            if key not in exclude_keys and hasattr(config, key):
+            if key in _UPDATABLE_FIELDS:
                 setattr(config, key, value)
+        # 仅修改请求参数或响应头时也刷新更新时间，使详情接口的ETag失效
+        config.updated_at = func.now()
         
         # 处理请求参数（如果提供了）
         if "request_parameters" in config_data and isinstance(config_data["request_parameters"], list):
             # 先删除旧的参数
             # 软删除旧的参数
-            db.query(InterfaceParameter).filter(
+            await db.execute(update(InterfaceParameter).where(
                 InterfaceParameter.interface_config_id == config_id,
                 InterfaceParameter.is_deleted == False
-            ).update({"is_deleted": True}, synchronize_session=False)
+            ).values(is_deleted=True).execution_options(synchronize_session=False))
             # 创建新的参数
             for param_data in config_data["request_parameters"]:
                 if isinstance(param_data, dict) and param_data.get("name"):
@@ -619,11 +781,11 @@ async def update_config(
         if "response_headers" in config_data and isinstance(config_data["response_headers"], list):
             # 先删除旧的响应头
             # 软删除旧的响应头
-            db.query(InterfaceHeader).filter(
+            await db.execute(update(InterfaceHeader).where(
                 InterfaceHeader.interface_config_id == config_id,
                 InterfaceHeader.name.like("Response-%"),
                 InterfaceHeader.is_deleted == False
-            ).update({"is_deleted": True}, synchronize_session=False)
+            ).values(is_deleted=True).execution_options(synchronize_session=False))
             # 创建新的响应头
             headers_added = 0
             for header_data in config_data["response_headers"]:
@@ -639,8 +801,9 @@ async def update_config(
                     db.add(header)
                     headers_added += 1
         
-        db.commit()
-        db.refresh(config)
+        await db.commit()
+        invalidate_exec_context(interface_config_id=config_id)
+        await invalidate_table_configs_cache(current_user.id)
         
         return ResponseModel(
             success=True,
@@ -650,7 +813,7 @@ async def update_config(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error("更新接口配置失败: {}", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -662,43 +825,37 @@ async def update_config(
 async def delete_config(
     config_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """删除接口配置"""
     try:
-        config = db.query(InterfaceConfig).filter(
+        # 软删除接口配置（条件更新同时完成归属校验，无需先加载对象）
+        deleted = (await db.execute(update(InterfaceConfig).where(
             InterfaceConfig.id == config_id,
             InterfaceConfig.user_id == current_user.id,
             InterfaceConfig.is_deleted == False
-        ).first()
+        ).values(is_deleted=True).execution_options(synchronize_session=False))).rowcount
         
-        if not config:
+        if not deleted:
             raise HTTPException(status_code=404, detail="接口配置不存在")
         
-        if config.is_deleted:
-            raise HTTPException(status_code=404, detail="接口配置已被删除")
-        
-        # 软删除关联的参数和请求头
-        try:
-            # 使用synchronize_session=False避免加载对象到会话
-            updated_params = db.query(InterfaceParameter).filter(
-                InterfaceParameter.interface_config_id == config_id,
-                InterfaceParameter.is_deleted == False
-            ).update({"is_deleted": True}, synchronize_session=False)
-            updated_headers = db.query(InterfaceHeader).filter(
-                InterfaceHeader.interface_config_id == config_id,
-                InterfaceHeader.is_deleted == False
-            ).update({"is_deleted": True}, synchronize_session=False)
-            logger.info(f"软删除接口配置 {config_id} 的关联数据: {updated_params} 个参数, {updated_headers} 个请求头/响应头")
-            db.flush()  # 确保删除操作被提交到数据库
-        except Exception as e:
-            logger.warning("软删除关联数据时出现警告（可能不存在）: {}", e)
-            # 即使删除关联数据失败，也继续删除主配置
-        
-        # 软删除接口配置
-        config.is_deleted = True
-        db.commit()
-        logger.info(f"成功软删除接口配置 {config_id}")
+        # 在同一事务中软删除关联的参数和请求头/响应头
+        updated_params = (await db.execute(update(InterfaceParameter).where(
+            InterfaceParameter.interface_config_id == config_id,
+            InterfaceParameter.is_deleted == False
+        ).values(is_deleted=True).execution_options(synchronize_session=False))).rowcount
+        updated_headers = (await db.execute(update(InterfaceHeader).where(
+            InterfaceHeader.interface_config_id == config_id,
+            InterfaceHeader.is_deleted == False
+        ).values(is_deleted=True).execution_options(synchronize_session=False))).rowcount
+        
+        await db.commit()
+        invalidate_exec_context(interface_config_id=config_id)
+        await invalidate_table_configs_cache(current_user.id)
+        logger.info(
+            "成功软删除接口配置 {}: {} 个参数, {} 个请求头/响应头",
+            config_id, updated_params, updated_headers
+        )
         
         return ResponseModel(
             success=True,
@@ -707,7 +864,7 @@ async def delete_config(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         # 使用 logger.exception 或 {} 占位符避免格式化错误
         logger.exception("删除接口配置失败")
         raise HTTPException(
@@ -719,71 +876,51 @@ async def delete_config(
 @router.get("/{config_id}/samples", response_model=ResponseModel)
 async def get_interface_samples(
     config_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """获取接口的入参出参样例数据"""
     try:
-        config = db.query(InterfaceConfig).filter(
+        config = await db.scalar(select(InterfaceConfig).where(
             InterfaceConfig.id == config_id,
             InterfaceConfig.user_id == current_user.id,
             InterfaceConfig.is_deleted == False
-        ).first()
+        ))
         
         if not config:
             raise HTTPException(status_code=404, detail="接口配置不存在")
         
+        not_modified = _not_modified_or_tag(request, response, _build_etag(config))
+        if not_modified:
+            return not_modified
+        
         # 生成请求参数样例
-        request_sample = {}
-        if config.entry_mode == "expert" and config.sql_statement:
-            parsed = parse_sql_parameters(config.sql_statement)
-            for param in parsed.get("request_parameters", []):
-                param_name = param.get("name")
-                param_type = param.get("type", "string")
-                if param_type == "integer":
-                    request_sample[param_name] = 1
-                elif param_type == "number":
-                    request_sample[param_name] = 1.0
-                elif param_type == "boolean":
-                    request_sample[param_name] = True
-                else:
-                    request_sample[param_name] = "示例值"
+        request_sample = _build_request_sample(_extract_request_parameters(config))
         
         # 如果启用了分页，添加分页参数到样例
         if config.enable_pagination:
-            request_sample["pageNumber"] = 1
-            request_sample["pageSize"] = 10
-        elif config.entry_mode == "graphical" and config.where_conditions:
-            for cond in config.where_conditions:
-                if cond.get("value_type") == "variable" and cond.get("variable_name"):
-                    request_sample[cond.get("variable_name")] = "示例值"
+            request_sample.update(_PAGINATION_SAMPLE)
         
         # 生成响应样例（基于字段信息）
-        response_data = {
-            "data": [],
-            "count": 0,
-            "pageNumber": 1,
-            "pageSize": 10
-        }
+        response_data = {**_RESPONSE_SAMPLE_DATA}
         if config.return_total_count:
             response_data["total"] = 0
         
+        if config.entry_mode == "graphical" and config.selected_fields:
+            # 图形模式：根据选择的字段生成样例数据（只显示前5个字段）
+            response_data["data"] = [dict.fromkeys(config.selected_fields[:5], _DEFAULT_SAMPLE)]
+            response_data["count"] = 1
+            if config.enable_pagination and config.return_total_count:
+                response_data["total"] = 1
+        
         response_sample = {
             "success": True,
             "message": "success",
             "data": response_data
         }
         
-        if config.entry_mode == "graphical" and config.selected_fields:
-            # 图形模式：根据选择的字段生成样例数据
-            sample_row = {}
-            for field in config.selected_fields[:5]:  # 只显示前5个字段
-                sample_row[field] = "示例值"
-            response_sample["data"]["data"] = [sample_row]
-            response_sample["data"]["count"] = 1
-            if config.enable_pagination and config.return_total_count:
-                response_sample["data"]["total"] = 1
-        
         return ResponseModel(
             success=True,
             message="获取样例数据成功",
@@ -806,51 +943,44 @@ async def get_interface_samples(
 async def get_interface_api_doc(
     config_id: int,
     request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """生成接口的API文档"""
     try:
-        config = db.query(InterfaceConfig).filter(
+        config = await db.scalar(select(InterfaceConfig).where(
             InterfaceConfig.id == config_id,
             InterfaceConfig.user_id == current_user.id,
             InterfaceConfig.is_deleted == False
-        ).first()
+        ))
         
         if not config:
             raise HTTPException(status_code=404, detail="接口配置不存在")
         
-        db_config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config.database_config_id).first()
+        # 文档中的base_url取自请求头，需要一并计入ETag
+        not_modified = _not_modified_or_tag(
+            request, response,
+            _build_etag(config, request.headers.get("host"), request.headers.get("x-forwarded-proto"))
+        )
+        if not_modified:
+            return not_modified
         
         # 获取请求参数和响应参数
-        request_parameters = []
+        request_parameters = _extract_request_parameters(config)
         response_parameters = []
         
         if config.entry_mode == "expert" and config.sql_statement:
-            parsed = parse_sql_parameters(config.sql_statement)
-            request_parameters = parsed.get("request_parameters", [])
-            response_parameters = parsed.get("response_parameters", [])
-        elif config.entry_mode == "graphical":
-            # 图形模式：从WHERE条件中提取请求参数
-            if config.where_conditions:
-                for cond in config.where_conditions:
-                    if cond.get("value_type") == "variable" and cond.get("variable_name"):
-                        request_parameters.append({
-                            "name": cond.get("variable_name"),
-                            "type": "string",
-                            "description": cond.get("description", ""),
-                            "constraint": "required" if cond.get("required", True) else "optional",
-                            "location": "query"
-                        })
+            response_parameters = parse_sql_parameters(config.sql_statement)["response_parameters"]
+        elif config.entry_mode == "graphical" and config.selected_fields:
             # 图形模式：从selected_fields中提取响应参数（数据字段）
-            if config.selected_fields:
-                for field in config.selected_fields:
-                    response_parameters.append({
-                        "name": field,
-                        "type": "string",  # 默认类型，实际类型可以从数据库schema获取
-                        "description": f"字段 {field}",
-                        "constraint": "required"
-                    })
+            for field in config.selected_fields:
+                response_parameters.append({
+                    "name": field,
+                    "type": "string",  # 默认类型，实际类型可以从数据库schema获取
+                    "description": f"字段 {field}",
+                    "constraint": "required"
+                })
         
         # 如果启用了分页，添加分页参数到请求参数
         if config.enable_pagination:
@@ -870,8 +1000,6 @@ async def get_interface_api_doc(
             })
         
         # 获取服务器地址和端口（从环境变量或请求头获取）
-        from app.core.config import settings
-        
         if settings.API_SERVER_HOST:
             # 优先使用环境变量配置的服务器IP
             hostname = settings.API_SERVER_HOST
@@ -896,6 +1024,15 @@ async def get_interface_api_doc(
         if not proxy_path.startswith("/api"):
             proxy_path = f"/api{proxy_path}"
         
+        # 生成响应样例
+        response_data = {**_RESPONSE_SAMPLE_DATA}
+        if config.entry_mode == "graphical" and config.selected_fields:
+            response_data["data"] = [dict.fromkeys(config.selected_fields[:5], _DEFAULT_SAMPLE)]
+            response_data["count"] = 1
+            response_data["total"] = 1
+        elif config.return_total_count:
+            response_data["total"] = 0
+        
         # 构建API文档
         api_doc = {
             "title": config.interface_name,
@@ -910,7 +1047,7 @@ async def get_interface_api_doc(
                     "Content-Type": config.request_format
                 },
                 "parameters": request_parameters,
-                "sample": {}
+                "sample": _build_request_sample(request_parameters)
             },
             "response_parameters": response_parameters,
             "response": {
@@ -919,12 +1056,7 @@ async def get_interface_api_doc(
                 "sample": {
                     "success": True,
                     "message": "success",
-                    "data": {
-                        "data": [],
-                        "count": 0,
-                        "pageNumber": 1,
-                        "pageSize": 10
-                    } | ({"total": 0} if config.return_total_count else {})
+                    "data": response_data
                 }
             },
             "pagination": {
@@ -938,33 +1070,6 @@ async def get_interface_api_doc(
             }
         }
         
-        # 生成请求样例
-        for param in request_parameters:
-            param_name = param.get("name")
-            param_type = param.get("type", "string")
-            # 分页参数使用默认值
-            if param_name == "pageNumber":
-                api_doc["request"]["sample"][param_name] = 1
-            elif param_name == "pageSize":
-                api_doc["request"]["sample"][param_name] = 10
-            elif param_type == "integer":
-                api_doc["request"]["sample"][param_name] = 1
-            elif param_type == "number":
-                api_doc["request"]["sample"][param_name] = 1.0
-            elif param_type == "boolean":
-                api_doc["request"]["sample"][param_name] = True
-            else:
-                api_doc["request"]["sample"][param_name] = "示例值"
-        
-        # 生成响应样例
-        if config.entry_mode == "graphical" and config.selected_fields:
-            sample_row = {}
-            for field in config.selected_fields[:5]:
-                sample_row[field] = "示例值"
-            api_doc["response"]["sample"]["data"]["data"] = [sample_row]
-            api_doc["response"]["sample"]["data"]["count"] = 1
-            api_doc["response"]["sample"]["data"]["total"] = 1
-        
         return ResponseModel(
             success=True,
             message="生成API文档成功",
@@ -2,48 +2,55 @@
 接口执行路由
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Body, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from app.core.database import get_local_db
-from app.models import User, InterfaceConfig, DatabaseConfig
+from app.core.config import settings
+from app.core import rate_limiter, audit_writer
+from app.models import User, InterfaceConfig, DatabaseConfig, InterfaceHeader
 from app.schemas import ResponseModel
 from app.core.security import get_current_active_user, get_current_user
 from app.core.db_factory import DatabaseConnectionFactory
 from app.core.sql_dialect import SQLDialectFactory
 from app.core.log_sanitizer import safe_log_sql, safe_log_params
 from app.core.exceptions import NotFoundError, SQLExecutionError, ValidationError
-from app.core.sql_utils import process_sql_params, execute_sql_query, convert_rows_to_dicts
+from app.core.sql_utils import process_sql_params, execute_sql_query, convert_rows_to_dicts, build_text_clause
 from loguru import logger
 from sqlalchemy import text
-from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import ipaddress
 import json
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 router = APIRouter(prefix="/api/v1/interfaces", tags=["接口执行"])
 
 
-def check_rate_limit(interface_config: InterfaceConfig, client_ip: str) -> bool:
+def check_rate_limit(interface_config: InterfaceConfig, client_ip: str) -> Tuple[bool, int]:
     """
-    检查限流
+    检查限流（按接口+客户端IP，GCRA算法，Redis可用时多进程共享限额）
     
-    注意：当前为简单实现，仅记录日志
-    计划：使用Redis实现基于令牌桶或滑动窗口的限流算法
-    当前：所有请求都通过限流检查
+    Returns:
+        (是否允许, 需等待的秒数) 元组
     """
     if not interface_config.enable_rate_limit:
-        return True
+        return True, 0
     
-    # 简单实现：仅记录日志，实际应该使用Redis实现限流
-    # 可以使用Redis的INCR和EXPIRE实现滑动窗口限流
-    logger.info("接口 {} 启用限流，客户端IP: {} (当前为简单实现，未实际限流)", interface_config.id, client_ip)
-    return True
+    allowed, retry_after = rate_limiter.acquire(
+        f"rl:{interface_config.id}:{client_ip}",
+        settings.RATE_LIMIT_PER_MINUTE,
+        60
+    )
+    if not allowed:
+        logger.warning("接口 {} 触发限流，客户端IP: {}，{} 秒后可重试", interface_config.id, client_ip, retry_after)
+    return allowed, retry_after
 
 
 def ip_in_range(ip: str, ip_range: str) -> bool:
     """检查IP是否在指定范围内（支持CIDR格式）"""
-    import ipaddress
     try:
         if '/' in ip_range:
             # CIDR格式
@@ -52,10 +59,67 @@ def ip_in_range(ip: str, ip_range: str) -> bool:
         else:
             # 单个IP
             return ip == ip_range
-    except:
+    except ValueError:
         return False
 
 
+# 已解析的白名单/黑名单：(config_id, 名单类型) -> (原始配置文本, 解析结果)
+# 解析结果为 ({(IP版本, 前缀长度, 网络地址整数): 配置项}, {IP版本: [出现过的前缀长度]})，
+# 匹配时只需对出现过的每个前缀长度做一次掩码+哈希查找，与名单条目数无关
+_IP_LIST_CACHE: Dict[Tuple[Any, str], Tuple[str, Tuple[Dict[Tuple[int, int, int], str], Dict[int, List[int]]]]] = {}
+
+
+def _parse_ip_list(raw_ips: str) -> Tuple[Dict[Tuple[int, int, int], str], Dict[int, List[int]]]:
+    """解析换行分隔的IP列表，单个IP按/32（IPv6为/128）网络处理，无法解析的配置项跳过"""
+    networks: Dict[Tuple[int, int, int], str] = {}
+    prefixes: Dict[int, set] = {}
+    for entry in raw_ips.split('\n'):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            network = ipaddress.ip_network(entry, strict=False)
+        except ValueError:
+            logger.warning("无法解析的IP配置项: {}", entry)
+            continue
+        networks.setdefault((network.version, network.prefixlen, int(network.network_address)), entry)
+        prefixes.setdefault(network.version, set()).add(network.prefixlen)
+    # 前缀长度从长到短排列，优先命中更精确的配置项
+    return networks, {version: sorted(lengths, reverse=True) for version, lengths in prefixes.items()}
+
+
+def _get_ip_list(interface_config: InterfaceConfig, kind: str, raw_ips: str):
+    """按接口ID获取已解析的IP列表，配置文本变化时重新解析"""
+    key = (interface_config.id, kind)
+    cached = _IP_LIST_CACHE.get(key)
+    if cached is not None and cached[0] == raw_ips:
+        return cached[1]
+    parsed = _parse_ip_list(raw_ips)
+    _IP_LIST_CACHE[key] = (raw_ips, parsed)
+    return parsed
+
+
+def _match_ip_list(client_ip: str, ip_list) -> Optional[str]:
+    """返回客户端IP命中的配置项，未命中返回None"""
+    networks, prefixes = ip_list
+    try:
+        client = ipaddress.ip_address(client_ip)
+    except ValueError:
+        return None
+    lengths = prefixes.get(client.version)
+    if not lengths:
+        return None
+    ip_int = int(client)
+    max_len = client.max_prefixlen
+    full_mask = (1 << max_len) - 1
+    for prefixlen in lengths:
+        mask = (full_mask << (max_len - prefixlen)) & full_mask
+        entry = networks.get((client.version, prefixlen, ip_int & mask))
+        if entry is not None:
+            return entry
+    return None
+
+
 def check_whitelist(interface_config: InterfaceConfig, client_ip: str) -> bool:
     """检查白名单"""
     if not interface_config.enable_whitelist:
@@ -66,14 +130,12 @@ def check_whitelist(interface_config: InterfaceConfig, client_ip: str) -> bool:
         logger.warning("接口 {} 启用白名单但未配置IP地址，拒绝访问", interface_config.id)
         return False
     
-    # 解析白名单IP列表（换行分隔）
-    whitelist_ips = [ip.strip() for ip in interface_config.whitelist_ips.split('\n') if ip.strip()]
-    
     # 检查客户端IP是否在白名单中
-    for ip_range in whitelist_ips:
-        if ip_in_range(client_ip, ip_range):
-            logger.info("接口 {} 白名单检查通过，客户端IP: {} 匹配 {}", interface_config.id, client_ip, ip_range)
-            return True
+    whitelist = _get_ip_list(interface_config, "whitelist", interface_config.whitelist_ips)
+    matched = _match_ip_list(client_ip, whitelist)
+    if matched is not None:
+        logger.info("接口 {} 白名单检查通过，客户端IP: {} 匹配 {}", interface_config.id, client_ip, matched)
+        return True
     
     logger.warning("接口 {} 白名单检查失败，客户端IP: {} 不在白名单中", interface_config.id, client_ip)
     return False
@@ -88,20 +150,17 @@ def check_blacklist(interface_config: InterfaceConfig, client_ip: str) -> bool:
     if not interface_config.blacklist_ips or not interface_config.blacklist_ips.strip():
         return True
     
-    # 解析黑名单IP列表（换行分隔）
-    blacklist_ips = [ip.strip() for ip in interface_config.blacklist_ips.split('\n') if ip.strip()]
-    
     # 检查客户端IP是否在黑名单中
-    for ip_range in blacklist_ips:
-        if ip_in_range(client_ip, ip_range):
-            logger.warning("接口 {} 黑名单检查失败，客户端IP: {} 匹配黑名单 {}", interface_config.id, client_ip, ip_range)
-            return False
+    blacklist = _get_ip_list(interface_config, "blacklist", interface_config.blacklist_ips)
+    matched = _match_ip_list(client_ip, blacklist)
+    if matched is not None:
+        logger.warning("接口 {} 黑名单检查失败，客户端IP: {} 匹配黑名单 {}", interface_config.id, client_ip, matched)
+        return False
     
     return True
 
 
 def audit_log(
-    db: Session,
     interface_config: InterfaceConfig,
     client_ip: str,
     user_id: Optional[int],
@@ -114,10 +173,9 @@ def audit_log(
     error_message: Optional[str] = None
 ):
     """
-    记录审计日志到数据库
+    记录审计日志（放入队列，由后台线程批量写入数据库）
     
     Args:
-        db: 数据库会话
         interface_config: 接口配置
         client_ip: 客户端IP
         user_id: 用户ID
@@ -133,35 +191,23 @@ def audit_log(
         return
     
     try:
-        from app.models import AuditLog
-        import json
-        
-        # 创建审计日志记录
-        audit_record = AuditLog(
-            interface_id=interface_config.id,
-            user_id=user_id,
-            client_ip=client_ip,
-            action=action,
-            resource_type="interface",
-            resource_id=interface_config.id,
-            details=json.dumps(details, ensure_ascii=False, default=str),
-            sql_statement=safe_log_sql(sql_statement, 1000) if sql_statement else None,  # 脱敏并限制长度
-            execution_time=execution_time,
-            row_count=row_count,
-            success=success,
-            error_message=error_message[:500] if error_message else None  # 限制长度
-        )
-        db.add(audit_record)
-        db.commit()
-        
-        logger.info(
-            f"审计日志已记录 - 接口ID: {interface_config.id}, "
-            f"操作: {action}, 用户ID: {user_id}, IP: {client_ip}"
-        )
+        audit_writer.enqueue({
+            "interface_id": interface_config.id,
+            "user_id": user_id,
+            "client_ip": client_ip,
+            "action": action,
+            "resource_type": "interface",
+            "resource_id": interface_config.id,
+            "details": json.dumps(details, ensure_ascii=False, default=str),
+            "sql_statement": safe_log_sql(sql_statement, 1000) if sql_statement else None,  # 脱敏并限制长度
+            "execution_time": execution_time,
+            "row_count": row_count,
+            "success": success,
+            "error_message": error_message[:500] if error_message else None  # 限制长度
+        })
     except Exception as e:
         # 审计日志记录失败不应影响主流程
         logger.error(f"记录审计日志失败: {e}", exc_info=True)
-        db.rollback()
 
 
 def get_client_ip(request: Request) -> str:
@@ -183,6 +229,79 @@ def get_client_ip(request: Request) -> str:
     return "unknown"
 
 
+# SQL中已包含分页的关键字
+_PAGINATION_KEYWORDS = ("LIMIT", "OFFSET", "FETCH", "ROWNUM", "TOP ")
+# 支持将已有LIMIT的SQL作为子查询再分页的数据库类型
+_SUBQUERY_PAGINATION_TYPES = ("mysql", "postgresql", "sqlite")
+# 连接池只有单个连接的数据库类型，COUNT查询在同一连接上顺序执行
+_SERIAL_COUNT_TYPES = ("sqlite",)
+# 与数据查询并行执行COUNT查询的线程池
+_COUNT_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="interface-count")
+
+
+def _append_limit_clause(sql: str, limit_clause: str, db_type: str) -> str:
+    """根据数据库类型将LIMIT/分页子句追加到SQL"""
+    if db_type in ["oracle", "sqlserver"]:
+        # Oracle的FETCH FIRST、SQL Server的OFFSET/FETCH需要在ORDER BY之后
+        if "ORDER BY" in sql.upper():
+            return re.sub(r'(\s+ORDER\s+BY\s+[^;]+)', r'\1 ' + limit_clause, sql, flags=re.IGNORECASE)
+        if db_type == "sqlserver":
+            # 如果没有ORDER BY，SQL Server需要添加ORDER BY
+            return f"{sql} ORDER BY (SELECT NULL) {limit_clause}"
+    # MySQL、PostgreSQL、SQLite等：直接在末尾添加
+    return f"{sql} {limit_clause}"
+
+
+# 支持会话级语句超时的数据库类型：(设置语句, 重置语句)，超时单位为毫秒
+_STATEMENT_TIMEOUT_SQL = {
+    "mysql": ("SET SESSION MAX_EXECUTION_TIME = {ms}", "SET SESSION MAX_EXECUTION_TIME = 0"),
+    "postgresql": ("SET statement_timeout = {ms}", "SET statement_timeout = 0"),
+}
+
+
+def _set_statement_timeout(conn: Any, db_type: str, timeout_seconds: Optional[int]) -> bool:
+    """
+    在数据库端设置语句超时，超时后由数据库终止查询
+    
+    Returns:
+        是否已设置（已设置的连接归还连接池前需要调用_reset_statement_timeout）
+    """
+    statements = _STATEMENT_TIMEOUT_SQL.get(db_type)
+    if not statements or not timeout_seconds or timeout_seconds <= 0:
+        return False
+    try:
+        conn.execute(text(statements[0].format(ms=int(timeout_seconds * 1000))))
+        return True
+    except Exception as e:
+        logger.warning("设置数据库语句超时失败: {}", e)
+        return False
+
+
+def _reset_statement_timeout(conn: Any, db_type: str):
+    """恢复连接的语句超时设置，避免影响连接池中后续使用该连接的查询"""
+    try:
+        conn.execute(text(_STATEMENT_TIMEOUT_SQL[db_type][1]))
+    except Exception as e:
+        logger.warning("恢复数据库语句超时设置失败: {}", e)
+
+
+def _execute_count_query(
+    engine: Any,
+    count_sql: str,
+    query_params: Dict[str, Any],
+    db_type: str,
+    timeout_seconds: Optional[int]
+) -> Optional[int]:
+    """使用独立连接执行COUNT查询"""
+    with engine.connect() as conn:
+        timeout_set = _set_statement_timeout(conn, db_type, timeout_seconds)
+        try:
+            return conn.execute(build_text_clause(count_sql, query_params), query_params).scalar()
+        finally:
+            if timeout_set:
+                _reset_statement_timeout(conn, db_type)
+
+
 def execute_interface_sql(
     interface_config: InterfaceConfig,
     db_config: DatabaseConfig,
@@ -220,24 +339,27 @@ def execute_interface_sql(
     sql = None
     start_time = None
     query_params = {}
+    timeout_set = False
     
     try:
         # 获取SQL方言适配器
         db_type = db_config.db_type or "mysql"
         adapter = SQLDialectFactory.get_adapter(db_type)
         
-        # 使用工厂创建数据库连接
+        # 从工厂获取缓存的引擎（按数据库配置复用连接池），只读查询直接使用连接执行
         engine = DatabaseConnectionFactory.create_engine(db_config)
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        db = SessionLocal()
+        db = engine.connect()
+        # 接口配置了超时时间时，由数据库端终止超时的查询
+        timeout_set = _set_statement_timeout(db, db_type, interface_config.timeout_seconds)
         
         try:
             # 获取SQL语句
             sql = None
+            query_params = {}
             
-            # 如果是图形模式，需要构建SQL
+            # 如果是图形模式，需要构建SQL（条件值作为绑定参数返回）
             if interface_config.entry_mode == "graphical":
-                sql = build_sql_from_graphical_config(interface_config, params, adapter)
+                sql, query_params = build_sql_from_graphical_config(interface_config, params, adapter)
             else:
                 # 专家模式：使用配置的SQL语句
                 sql = interface_config.sql_statement
@@ -247,71 +369,63 @@ def execute_interface_sql(
 
             # 专家模式或问数模式：使用真正的参数化查询（防止SQL注入）
             # 使用公共函数处理SQL参数
-            query_params = {}
             if interface_config.entry_mode in ["expert", "query"]:
                 sql, query_params = process_sql_params(sql, params, interface_config.entry_mode)
             
+            # 去掉末尾的分号，否则追加LIMIT子句或包装为子查询后语法错误
+            sql = sql.strip().rstrip(";").rstrip()
+            
+            # 统计总数使用未追加LIMIT/分页子句的SQL
+            base_sql = sql
+            
+            # 无法下推到数据库的行数限制（仅在数据库类型不支持子查询包装或适配器不生成LIMIT子句时），
+            # 执行时使用服务端游标只读取所需的行
+            row_offset = 0
+            row_limit = None
+            # SQL被包装为子查询时记录回退方案：(原SQL, 跳过行数, 读取行数)；
+            # 包装后执行失败（如MySQL子查询中存在重名列）时改为执行原SQL并流式读取
+            wrap_fallback = None
+            
             # 检查最大查询数量限制（仅在非分页模式下应用）
             if not interface_config.enable_pagination and interface_config.max_query_count:
                 # 使用适配器构建LIMIT子句
                 limit_clause = adapter.build_limit_clause(limit=interface_config.max_query_count)
-                if limit_clause:
-                    # 检查SQL中是否已有LIMIT/OFFSET/FETCH等分页关键字
-                    sql_upper = sql.upper()
-                    has_limit = any(keyword in sql_upper for keyword in ["LIMIT", "OFFSET", "FETCH", "ROWNUM", "TOP "])
-                    if not has_limit:
-                        # 根据数据库类型决定LIMIT子句的位置
-                        if db_type in ["oracle"]:
-                            # Oracle的FETCH FIRST需要在ORDER BY之后
-                            if "ORDER BY" in sql_upper:
-                                # 在ORDER BY之后添加
-                                sql = re.sub(r'(\s+ORDER\s+BY\s+[^;]+)', r'\1 ' + limit_clause, sql, flags=re.IGNORECASE)
-                            else:
-                                sql = f"{sql} {limit_clause}"
-                        elif db_type in ["sqlserver"]:
-                            # SQL Server的OFFSET/FETCH需要在ORDER BY之后
-                            if "ORDER BY" in sql_upper:
-                                sql = re.sub(r'(\s+ORDER\s+BY\s+[^;]+)', r'\1 ' + limit_clause, sql, flags=re.IGNORECASE)
-                            else:
-                                # 如果没有ORDER BY，SQL Server需要添加ORDER BY
-                                sql = f"{sql} ORDER BY (SELECT NULL) {limit_clause}"
-                        else:
-                            # MySQL、PostgreSQL、SQLite等：直接在末尾添加
-                            sql = f"{sql} {limit_clause}"
+                # 检查SQL中是否已有LIMIT/OFFSET/FETCH等分页关键字
+                sql_upper = sql.upper()
+                has_limit = any(keyword in sql_upper for keyword in _PAGINATION_KEYWORDS)
+                if limit_clause and not has_limit:
+                    sql = _append_limit_clause(sql, limit_clause, db_type)
+                elif limit_clause and db_type in _SUBQUERY_PAGINATION_TYPES:
+                    # SQL自带LIMIT等子句时，作为子查询再限制行数，仍由数据库只返回所需的行
+                    wrap_fallback = (sql, 0, interface_config.max_query_count)
+                    sql = f"SELECT * FROM ({sql}) AS limited_query {limit_clause}"
+                else:
+                    # 无法下推时流式读取，读够即停止
+                    row_limit = interface_config.max_query_count
             
-            # 如果启用了分页，在SQL执行前添加分页子句
+            # 如果启用了分页，在SQL执行前添加分页子句（分页下推到数据库，只传输当前页的数据）
             if interface_config.enable_pagination and page and page_size:
-                sql_upper = sql.upper()
-                sql_has_pagination = any(keyword in sql_upper for keyword in [
-                    "LIMIT", "OFFSET", "FETCH", "ROWNUM", "TOP "
-                ])
+                offset = (page - 1) * page_size
+                limit_clause = adapter.build_limit_clause(limit=page_size, offset=offset)
                 
-                if not sql_has_pagination:
-                    # 计算offset
-                    offset = (page - 1) * page_size
-                    limit_clause = adapter.build_limit_clause(limit=page_size, offset=offset)
-                    
-                    if limit_clause:
-                        # 根据数据库类型添加分页子句
-                        if db_type == "oracle":
-                            if "ORDER BY" in sql_upper:
-                                sql = re.sub(r'(\s+ORDER\s+BY\s+[^;]+)', r'\1 ' + limit_clause, sql, flags=re.IGNORECASE)
-                            else:
-                                sql = f"{sql} {limit_clause}"
-                        elif db_type == "sqlserver":
-                            if "ORDER BY" in sql_upper:
-                                sql = re.sub(r'(\s+ORDER\s+BY\s+[^;]+)', r'\1 ' + limit_clause, sql, flags=re.IGNORECASE)
-                            else:
-                                sql = f"{sql} ORDER BY (SELECT NULL) {limit_clause}"
-                        else:
-                            sql = f"{sql} {limit_clause}"
+                sql_upper = sql.upper()
+                if limit_clause and not any(keyword in sql_upper for keyword in _PAGINATION_KEYWORDS):
+                    sql = _append_limit_clause(sql, limit_clause, db_type)
+                elif limit_clause and db_type in _SUBQUERY_PAGINATION_TYPES:
+                    # SQL自带LIMIT等子句时，作为子查询再分页，避免返回全部结果
+                    wrap_fallback = (sql, offset, page_size)
+                    sql = f"SELECT * FROM ({sql}) AS paged_query {limit_clause}"
+                else:
+                    # 无法下推时流式读取，跳过前面的行并只保留当前页
+                    row_offset = offset
+                    row_limit = page_size
             
             # 记录执行开始时间
             start_time = time.time()
             
             # 执行查询 - 使用参数化查询防止SQL注入
             # 检查SQL中是否还有未提供的占位符
-            remaining_placeholders = re.findall(r':(\w+)', sql)
+            remaining_placeholders = [p for p in re.findall(r':(\w+)', sql) if p not in query_params]
             if remaining_placeholders:
                 raise ValidationError(
                     f"SQL查询包含未提供的参数占位符: {', '.join(remaining_placeholders)}",
@@ -319,47 +433,44 @@ def execute_interface_sql(
                     errors=[{"param": p, "message": f"缺少必需参数: {p}"} for p in remaining_placeholders]
                 )
             
+            # 如果需要返回总数，COUNT查询使用连接池中的另一个连接与数据查询并行执行
+            count_sql = None
+            count_future = None
+            if interface_config.return_total_count:
+                if db_type == "oracle":
+                    count_sql = f"SELECT COUNT(*) as total FROM ({base_sql})"
+                else:
+                    count_sql = f"SELECT COUNT(*) as total FROM ({base_sql}) as subquery"
+                if db_type not in _SERIAL_COUNT_TYPES:
+                    count_future = _COUNT_EXECUTOR.submit(
+                        _execute_count_query, engine, count_sql, query_params,
+                        db_type, interface_config.timeout_seconds
+                    )
+            
             # 使用公共函数执行SQL查询和转换结果
-            rows, columns = execute_sql_query(db, sql, query_params)
+            try:
+                rows, columns = execute_sql_query(db, sql, query_params, offset=row_offset, limit=row_limit)
+            except Exception as e:
+                if wrap_fallback is None:
+                    raise
+                logger.warning("子查询包装后的SQL执行失败，改为流式读取原SQL: {}", e)
+                # 回滚失败的事务（PostgreSQL事务出错后拒绝后续语句，回滚同时会撤销事务内设置的语句超时）
+                db.rollback()
+                timeout_set = _set_statement_timeout(db, db_type, interface_config.timeout_seconds) or timeout_set
+                sql, row_offset, row_limit = wrap_fallback
+                rows, columns = execute_sql_query(db, sql, query_params, offset=row_offset, limit=row_limit)
             data = convert_rows_to_dicts(rows, columns)
             
-            # 注意：如果启用了分页，分页已经在SQL执行前完成（第221-248行）
             # data已经是分页后的结果，不需要再次分页
             total = len(data)
             
-            # 如果需要返回总数，执行COUNT查询
             total_count = total
-            if interface_config.return_total_count:
-                # 构建COUNT查询（使用原始SQL，不包含分页子句）
-                count_sql = sql
-                
-                # 移除各种分页子句（根据数据库类型）
-                if db_type == "sqlserver":
-                    # SQL Server: 移除 OFFSET ... ROWS FETCH NEXT ... ROWS ONLY
-                    count_sql = re.sub(r'\s+OFFSET\s+\d+\s+ROWS\s+FETCH\s+NEXT\s+\d+\s+ROWS\s+ONLY', '', count_sql, flags=re.IGNORECASE)
-                    # 移除 TOP n
-                    count_sql = re.sub(r'\s+TOP\s+\d+', '', count_sql, flags=re.IGNORECASE)
-                elif db_type == "oracle":
-                    # Oracle: 移除 FETCH FIRST ... ROWS ONLY 和 OFFSET ... ROWS
-                    count_sql = re.sub(r'\s+OFFSET\s+\d+\s+ROWS\s+FETCH\s+FIRST\s+\d+\s+ROWS\s+ONLY', '', count_sql, flags=re.IGNORECASE)
-                    count_sql = re.sub(r'\s+FETCH\s+FIRST\s+\d+\s+ROWS\s+ONLY', '', count_sql, flags=re.IGNORECASE)
-                    # 移除 ROWNUM条件
-                    count_sql = re.sub(r'\s+AND\s+ROWNUM\s*[<>=]+\s*\d+', '', count_sql, flags=re.IGNORECASE)
-                else:
-                    # MySQL、PostgreSQL、SQLite: 移除 LIMIT n OFFSET m
-                    count_sql = re.sub(r'\s+LIMIT\s+\d+(\s+OFFSET\s+\d+)?', '', count_sql, flags=re.IGNORECASE)
-                
-                # 构建COUNT查询
-                # 对于Oracle，可能需要特殊处理
-                if db_type == "oracle":
-                    # Oracle的COUNT查询可能需要特殊处理
-                    count_sql = f"SELECT COUNT(*) as total FROM ({count_sql})"
-                else:
-                    count_sql = f"SELECT COUNT(*) as total FROM ({count_sql}) as subquery"
-                
+            if count_sql is not None:
                 try:
-                    count_result = db.execute(text(count_sql))
-                    total_count = count_result.scalar() or total
+                    if count_future is not None:
+                        total_count = count_future.result() or total
+                    else:
+                        total_count = db.execute(build_text_clause(count_sql, query_params), query_params).scalar() or total
                 except Exception as e:
                     logger.warning(f"执行COUNT查询失败，使用数据长度作为总数: {e}")
                     total_count = total
@@ -383,7 +494,6 @@ def execute_interface_sql(
             row_count = len(data)
             if client_ip:
                 audit_log(
-                    db=db,
                     interface_config=interface_config,
                     client_ip=client_ip,
                     user_id=user_id,
@@ -402,17 +512,15 @@ def execute_interface_sql(
             
             return result
         finally:
-            # 确保数据库会话和引擎正确关闭
+            # 将连接归还连接池（引擎由工厂缓存，不在此释放）
             if db is not None:
+                if timeout_set:
+                    _reset_statement_timeout(db, db_type)
+                    timeout_set = False
                 try:
                     db.close()
                 except Exception as close_error:
-                    logger.warning(f"关闭数据库会话时出错: {close_error}")
-            if engine is not None:
-                try:
-                    engine.dispose()
-                except Exception as dispose_error:
-                    logger.warning(f"释放数据库引擎时出错: {dispose_error}")
+                    logger.warning(f"关闭数据库连接时出错: {close_error}")
     except Exception as e:
         logger.error("执行接口SQL失败: {}", e, exc_info=True)
         
@@ -421,7 +529,6 @@ def execute_interface_sql(
             try:
                 execution_time = time.time() - start_time if start_time is not None else None
                 audit_log(
-                    db=db,  # 可能为None，audit_log应该处理
                     interface_config=interface_config,
                     client_ip=client_ip,
                     user_id=user_id,
@@ -447,31 +554,36 @@ def execute_interface_sql(
                 db.close()
             except Exception:
                 pass
-        if engine is not None:
-            try:
-                engine.dispose()
-            except Exception:
-                pass
 
 
-def build_sql_from_graphical_config(
-    interface_config: InterfaceConfig, 
-    params: Dict[str, Any],
-    adapter: Optional[Any] = None
-) -> str:
+# 图形模式条件运算符到SQL运算符的映射（未知运算符按等于处理）
+_OPERATORS = {
+    "equal": "=",
+    "not_equal": "!=",
+    "greater": ">",
+    "greater_equal": ">=",
+    "less": "<",
+    "less_equal": "<=",
+    "like": "LIKE",
+    "not_like": "NOT LIKE",
+    "in": "IN",
+    "not_in": "NOT IN",
+}
+_NULL_OPERATORS = {"is_null": "IS NULL", "is_not_null": "IS NOT NULL"}
+_LIST_OPERATORS = frozenset(("in", "not_in"))
+
+# 图形模式SQL模板缓存：{(接口配置ID, 方言适配器类型): (配置更新时间, 编译后的模板)}
+_GRAPHICAL_TEMPLATE_CACHE: Dict[Tuple[int, type], Tuple[Any, Dict[str, Any]]] = {}
+
+
+def _compile_graphical_config(interface_config: InterfaceConfig, adapter: Any) -> Dict[str, Any]:
     """
-    从图形配置构建SQL
+    将图形配置编译为SQL模板（字段、表名的转义和条件解析只在编译时执行一次）
     
-    Args:
-        interface_config: 接口配置对象
-        params: 参数字典
-        adapter: SQL方言适配器（如果为None，则使用MySQL适配器）
+    Returns:
+        模板字典：base_sql为SELECT ... FROM部分，conditions为WHERE条件列表
+        [(条件SQL前缀, 运算符类型, 变量名, 常量值)]，order_by为ORDER BY子句
     """
-    # 如果没有提供适配器，使用MySQL适配器（向后兼容）
-    if adapter is None:
-        from app.core.sql_dialect import SQLDialectFactory
-        adapter = SQLDialectFactory.get_adapter("mysql")
-    
     # 构建SELECT字段
     if interface_config.selected_fields:
         # 使用适配器转义字段名
@@ -486,308 +598,226 @@ def build_sql_from_graphical_config(
     
     # 使用适配器转义表名
     escaped_table_name = adapter.escape_identifier(table_name)
-    sql = f"SELECT {fields} FROM {escaped_table_name}"
-    
-    # 构建WHERE子句
-    where_conditions = interface_config.where_conditions or []
-    if where_conditions:
-        where_parts = []
-        for cond in where_conditions:
-            field = cond.get("field")
-            operator = cond.get("operator", "equal")
-            value_type = cond.get("value_type", "constant")
-            value = cond.get("value")
-            variable_name = cond.get("variable_name")
-            logic = cond.get("logic", "AND")
-            
-            if not field:
-                continue
-            
-            # 使用适配器转义字段名
-            escaped_field = adapter.escape_identifier(field)
-            
-            # 构建条件表达式
-            if operator == "equal":
-                op = "="
-            elif operator == "not_equal":
-                op = "!="
-            elif operator == "greater":
-                op = ">"
-            elif operator == "greater_equal":
-                op = ">="
-            elif operator == "less":
-                op = "<"
-            elif operator == "less_equal":
-                op = "<="
-            elif operator == "like":
-                op = "LIKE"
-            elif operator == "not_like":
-                op = "NOT LIKE"
-            elif operator == "in":
-                op = "IN"
-            elif operator == "not_in":
-                op = "NOT IN"
-            elif operator == "is_null":
-                where_parts.append(f"{escaped_field} IS NULL")
-                continue
-            elif operator == "is_not_null":
-                where_parts.append(f"{escaped_field} IS NOT NULL")
-                continue
-            else:
-                op = "="
-            
-            # 转义SQL字符串值，防止SQL注入
-            def escape_sql_value(val):
-                """转义SQL字符串值"""
-                if isinstance(val, str):
-                    # 转义单引号：' -> ''
-                    escaped = val.replace("'", "''")
-                    # 转义反斜杠：\ -> \\
-                    escaped = escaped.replace("\\", "\\\\")
-                    return escaped
-                return str(val)
-            
-            # 获取值
-            if value_type == "variable" and variable_name:
-                # 从参数中获取值
-                param_value = params.get(variable_name)
-                if param_value is None:
-                    # 如果参数不存在，跳过这个WHERE条件（不添加到WHERE子句中）
-                    continue
-                if operator in ["like", "not_like"]:
-                    escaped_val = escape_sql_value(param_value)
-                    cond_value = f"'{escaped_val}'"
-                elif operator in ["in", "not_in"]:
-                    if isinstance(param_value, list):
-                        values = ", ".join([f"'{escape_sql_value(v)}'" if isinstance(v, str) else str(v) for v in param_value])
-                    else:
-                        escaped_val = escape_sql_value(param_value)
-                        values = f"'{escaped_val}'"
-                    cond_value = f"({values})"
-                else:
-                    if isinstance(param_value, str):
-                        escaped_val = escape_sql_value(param_value)
-                        cond_value = f"'{escaped_val}'"
-                    else:
-                        cond_value = str(param_value)
-            else:
-                # 常量值
-                if operator in ["like", "not_like"]:
-                    escaped_val = escape_sql_value(value)
-                    cond_value = f"'{escaped_val}'"
-                elif operator in ["in", "not_in"]:
-                    if isinstance(value, list):
-                        values = ", ".join([f"'{escape_sql_value(v)}'" if isinstance(v, str) else str(v) for v in value])
-                    else:
-                        escaped_val = escape_sql_value(value)
-                        values = f"'{escaped_val}'"
-                    cond_value = f"({values})"
-                else:
-                    if isinstance(value, str):
-                        escaped_val = escape_sql_value(value)
-                        cond_value = f"'{escaped_val}'"
-                    else:
-                        cond_value = str(value)
-            
-            where_parts.append(f"{escaped_field} {op} {cond_value}")
-        
-        if where_parts:
-            sql += " WHERE " + " AND ".join(where_parts)
+    base_sql = f"SELECT {fields} FROM {escaped_table_name}"
     
-    # 构建ORDER BY子句
-    order_by_fields = interface_config.order_by_fields or []
-    if order_by_fields:
-        order_parts = []
-        for order in order_by_fields:
-            field = order.get("field")
-            direction = order.get("direction", "ASC")
-            if field:
-                # 使用适配器转义字段名
-                escaped_field = adapter.escape_identifier(field)
-                order_parts.append(f"{escaped_field} {direction}")
-        if order_parts:
-            sql += " ORDER BY " + ", ".join(order_parts)
-    
-    # 如果启用分页，添加分页子句
-    # 注意：这里不处理分页，分页在execute_interface_sql中处理
-    # 但如果有需要，可以在这里添加
-    
-    return sql
-
-
-@router.get("/{config_id}/execute", response_model=ResponseModel)
-async def execute_interface_get(
-    config_id: int,
-    request: Request,
-    pageNumber: Optional[int] = Query(None, ge=1, alias="pageNumber"),
-    pageSize: Optional[int] = Query(None, ge=1, le=1000, alias="pageSize"),
-    # 兼容旧参数名
-    page: Optional[int] = Query(None, ge=1),
-    page_size: Optional[int] = Query(None, ge=1, le=1000),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
-):
-    """执行接口（GET请求）"""
-    try:
-        # 获取接口配置
-        interface_config = db.query(InterfaceConfig).filter(
-            InterfaceConfig.id == config_id,
-            InterfaceConfig.user_id == current_user.id
-        ).first()
+    # 解析WHERE条件，值在请求时通过绑定参数传入，不拼接到SQL中
+    conditions = []
+    for cond in interface_config.where_conditions or []:
+        field = cond.get("field")
+        operator = cond.get("operator", "equal")
+        value_type = cond.get("value_type", "constant")
+        variable_name = cond.get("variable_name")
         
-        if not interface_config:
-            raise HTTPException(status_code=404, detail="接口配置不存在")
-        
-        # 允许执行草稿状态的接口（用于测试），但禁用状态的接口不能执行
-        if interface_config.status == "inactive":
-            raise HTTPException(status_code=400, detail="接口已禁用，无法执行。请将接口状态设置为'激活'或'草稿'")
+        if not field:
+            continue
         
-        # 检查图形模式下的必要字段
-        if interface_config.entry_mode == "graphical":
-            if not interface_config.table_name:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="图形模式接口配置不完整：表名为空。请编辑接口配置，在图形模式下选择数据表。"
-                )
-        
-        # 获取数据库配置
-        db_config = db.query(DatabaseConfig).filter(
-            DatabaseConfig.id == interface_config.database_config_id
-        ).first()
-        
-        if not db_config:
-            raise HTTPException(status_code=404, detail="数据库配置不存在")
-        
-        # 检查认证
-        if interface_config.proxy_auth != "no_auth":
-            # 需要认证，验证token
-            try:
-                current_user = await get_current_user(request, db)
-            except:
-                raise HTTPException(status_code=401, detail="需要认证")
-        
-        # 获取查询参数
-        params = dict(request.query_params)
+        # 使用适配器转义字段名
+        escaped_field = adapter.escape_identifier(field)
         
-        # 处理分页参数：优先使用 pageNumber/pageSize，兼容 page/page_size
-        actual_page = pageNumber if pageNumber is not None else page
-        actual_page_size = pageSize if pageSize is not None else page_size
+        # 构建条件表达式
+        if operator in _NULL_OPERATORS:
+            conditions.append((f"{escaped_field} {_NULL_OPERATORS[operator]}", "null", None, None))
+            continue
+        op = _OPERATORS.get(operator, "=")
         
-        # 如果启用分页，使用分页参数；否则使用最大查询数量限制
-        if interface_config.enable_pagination:
-            # 分页模式：使用 pageNumber 和 pageSize
-            if actual_page is None:
-                actual_page = 1
-            if actual_page_size is None:
-                actual_page_size = 10
-            # 移除分页参数，避免传递给SQL
-            params.pop("pageNumber", None)
-            params.pop("pageSize", None)
-            params.pop("page", None)
-            params.pop("page_size", None)
+        kind = "list" if operator in _LIST_OPERATORS else "value"
+        if value_type == "variable" and variable_name:
+            conditions.append((f"{escaped_field} {op}", kind, variable_name, None))
         else:
-            # 非分页模式：使用 max_query_count 限制
-            actual_page = None
-            actual_page_size = None
-            # 移除分页参数
-            params.pop("pageNumber", None)
-            params.pop("pageSize", None)
-            params.pop("page", None)
-            params.pop("page_size", None)
-        
-        # 执行SQL
-        result = execute_interface_sql(
-            interface_config,
-            db_config,
-            params,
-            actual_page,
-            actual_page_size
-        )
-        
-        # 构建响应
-        response_data = ResponseModel(
-            success=True,
-            message="success",
-            data=result
-        )
-        
-        # 构建响应头
-        headers = {}
-        
-        # 如果启用了跨域，添加CORS响应头
-        if interface_config.enable_cors:
-            if interface_config.cors_allow_origin:
-                headers["Access-Control-Allow-Origin"] = interface_config.cors_allow_origin
-            if interface_config.cors_expose_headers:
-                headers["Access-Control-Expose-Headers"] = interface_config.cors_expose_headers
-            if interface_config.cors_max_age:
-                headers["Access-Control-Max-Age"] = str(interface_config.cors_max_age)
-            if interface_config.cors_allow_methods:
-                headers["Access-Control-Allow-Methods"] = interface_config.cors_allow_methods
-            if interface_config.cors_allow_headers:
-                headers["Access-Control-Allow-Headers"] = interface_config.cors_allow_headers
-            if interface_config.cors_allow_credentials is not None:
-                headers["Access-Control-Allow-Credentials"] = "true" if interface_config.cors_allow_credentials else "false"
-        
-        # 添加自定义HTTP响应头
-        try:
-            from app.models import InterfaceHeader
-            response_headers = db.query(InterfaceHeader).filter(
-                InterfaceHeader.interface_config_id == interface_config.id,
-                InterfaceHeader.name.like("Response-%")
-            ).all()
-            for header in response_headers:
-                # 移除Response-前缀
-                header_name = header.name.replace("Response-", "", 1) if header.name.startswith("Response-") else header.name
-                headers[header_name] = header.value
-        except Exception as e:
-            logger.warning("获取响应头失败: {}", e)
+            conditions.append((f"{escaped_field} {op}", kind, None, cond.get("value")))
+    
+    # 构建ORDER BY子句
+    order_by = ""
+    order_parts = []
+    for order in interface_config.order_by_fields or []:
+        field = order.get("field")
+        direction = order.get("direction", "ASC")
+        if field:
+            # 使用适配器转义字段名
+            escaped_field = adapter.escape_identifier(field)
+            order_parts.append(f"{escaped_field} {direction}")
+    if order_parts:
+        order_by = " ORDER BY " + ", ".join(order_parts)
+    
+    return {"base_sql": base_sql, "conditions": conditions, "order_by": order_by}
+
+
+def _get_graphical_template(interface_config: InterfaceConfig, adapter: Any) -> Dict[str, Any]:
+    """获取图形配置的SQL模板（按接口配置ID缓存，配置更新后重新编译）"""
+    if not interface_config.id:
+        return _compile_graphical_config(interface_config, adapter)
+    
+    cache_key = (interface_config.id, type(adapter))
+    version = interface_config.updated_at
+    cached = _GRAPHICAL_TEMPLATE_CACHE.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    template = _compile_graphical_config(interface_config, adapter)
+    _GRAPHICAL_TEMPLATE_CACHE[cache_key] = (version, template)
+    return template
+
+
+def build_sql_from_graphical_config(
+    interface_config: InterfaceConfig, 
+    params: Dict[str, Any],
+    adapter: Optional[Any] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    从图形配置构建SQL
+    
+    Args:
+        interface_config: 接口配置对象
+        params: 参数字典
+        adapter: SQL方言适配器（如果为None，则使用MySQL适配器）
         
-        # 如果有响应头，返回JSONResponse，否则返回普通ResponseModel
-        if headers:
-            return JSONResponse(
-                content=response_data.dict(),
-                headers=headers
-            )
+    Returns:
+        (SQL语句, 绑定参数字典) 元组，条件值均通过 :gp{n} 绑定参数传入（IN/NOT IN的值为列表）
+    """
+    # 如果没有提供适配器，使用MySQL适配器（向后兼容）
+    if adapter is None:
+        adapter = SQLDialectFactory.get_adapter("mysql")
+    
+    template = _get_graphical_template(interface_config, adapter)
+    
+    sql = template["base_sql"]
+    bind_params = {}
+    where_parts = []
+    for index, (prefix, kind, variable_name, value) in enumerate(template["conditions"]):
+        if kind == "null":
+            where_parts.append(prefix)
+            continue
+        
+        if variable_name:
+            # 从参数中获取值
+            value = params.get(variable_name)
+            if value is None:
+                # 如果参数不存在，跳过这个WHERE条件（不添加到WHERE子句中）
+                continue
         
-        return response_data
-    except HTTPException as e:
-        raise
-    except ValueError as e:
-        # 参数错误，返回400 Bad Request
-        logger.warning("执行接口失败（参数错误）: {}", e)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        logger.error("执行接口失败: {}", e, exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"执行接口失败: {str(e)}"
-        )
+        bind_name = f"gp{index}"
+        if kind == "list":
+            # IN/NOT IN使用展开参数，SQL文本与列表长度无关
+            bind_params[bind_name] = list(value) if isinstance(value, (list, tuple)) else [value]
+        else:
+            bind_params[bind_name] = value
+        where_parts.append(f"{prefix} :{bind_name}")
+    
+    if where_parts:
+        sql += " WHERE " + " AND ".join(where_parts)
+    
+    # 分页在execute_interface_sql中处理
+    return sql + template["order_by"], bind_params
 
 
-@router.post("/{config_id}/execute", response_model=ResponseModel)
-async def execute_interface_post(
+# 不传递给SQL的分页参数名
+_PAGINATION_PARAM_NAMES = frozenset(("pageNumber", "pageSize", "page", "page_size"))
+# 接口SQL用到的参数名缓存：{接口配置ID: (配置更新时间, 参数名集合)}
+_PARAM_NAMES_CACHE: Dict[int, Tuple[Any, frozenset]] = {}
+
+
+def _get_param_names(interface_config: InterfaceConfig) -> frozenset:
+    """获取接口SQL用到的参数名（专家/问数模式为SQL中的占位符，图形模式为条件变量名）"""
+    cached = _PARAM_NAMES_CACHE.get(interface_config.id)
+    if cached is not None and cached[0] == interface_config.updated_at:
+        return cached[1]
+    
+    if interface_config.entry_mode == "graphical":
+        names = {
+            cond.get("variable_name")
+            for cond in interface_config.where_conditions or []
+            if cond.get("field") and cond.get("value_type", "constant") == "variable" and cond.get("variable_name")
+        }
+    else:
+        names = set(re.findall(r':(\w+)', interface_config.sql_statement or ""))
+    param_names = frozenset(names - _PAGINATION_PARAM_NAMES)
+    
+    if interface_config.id:
+        _PARAM_NAMES_CACHE[interface_config.id] = (interface_config.updated_at, param_names)
+    return param_names
+
+
+# 接口执行上下文缓存：{(接口配置ID, 用户ID): (过期时间, 接口配置, 数据库配置)}
+# 缓存的是已从会话中分离的ORM对象，只读取其已加载的列属性
+_EXEC_CONTEXT_CACHE: Dict[Tuple[int, int], Tuple[float, InterfaceConfig, Optional[DatabaseConfig]]] = {}
+_EXEC_CONTEXT_CACHE_MAXSIZE = 1024
+
+
+def _load_exec_context(
+    config_id: int,
+    user_id: int,
+    db: Session
+) -> Tuple[Optional[InterfaceConfig], Optional[DatabaseConfig]]:
+    """
+    获取接口配置及其数据库配置（带TTL缓存）
+    
+    Returns:
+        (接口配置, 数据库配置) 元组，接口配置不存在时均为None
+    """
+    key = (config_id, user_id)
+    now = time.monotonic()
+    cached = _EXEC_CONTEXT_CACHE.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1], cached[2]
+    
+    interface_config = db.query(InterfaceConfig).filter(
+        InterfaceConfig.id == config_id,
+        InterfaceConfig.user_id == user_id
+    ).first()
+    if not interface_config:
+        _EXEC_CONTEXT_CACHE.pop(key, None)
+        return None, None
+    
+    db_config = db.query(DatabaseConfig).filter(
+        DatabaseConfig.id == interface_config.database_config_id
+    ).first()
+    
+    ttl = settings.INTERFACE_CONTEXT_CACHE_TTL
+    if ttl > 0:
+        # 分离对象，避免会话关闭或提交后属性过期
+        db.expunge(interface_config)
+        if db_config is not None:
+            db.expunge(db_config)
+        if len(_EXEC_CONTEXT_CACHE) >= _EXEC_CONTEXT_CACHE_MAXSIZE:
+            # 超出容量时淘汰最早写入的条目
+            _EXEC_CONTEXT_CACHE.pop(next(iter(_EXEC_CONTEXT_CACHE)), None)
+        _EXEC_CONTEXT_CACHE[key] = (now + ttl, interface_config, db_config)
+    return interface_config, db_config
+
+
+def invalidate_exec_context(interface_config_id: Optional[int] = None, database_config_id: Optional[int] = None):
+    """接口配置或数据库配置变更后清除对应的执行上下文缓存"""
+    for key, (_, interface_config, db_config) in list(_EXEC_CONTEXT_CACHE.items()):
+        if (interface_config_id is not None and key[0] == interface_config_id) or (
+            database_config_id is not None and db_config is not None and db_config.id == database_config_id
+        ):
+            _EXEC_CONTEXT_CACHE.pop(key, None)
+
+
+async def _run_interface(
     config_id: int,
     request: Request,
-    body: Dict[str, Any] = Body(None),
-    pageNumber: Optional[int] = Query(None, ge=1, alias="pageNumber"),
-    pageSize: Optional[int] = Query(None, ge=1, le=1000, alias="pageSize"),
-    # 兼容旧参数名
-    page: Optional[int] = Query(None, ge=1),
-    page_size: Optional[int] = Query(None, ge=1, le=1000),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    body: Dict[str, Any],
+    page: Optional[int],
+    page_size: Optional[int],
+    current_user: User,
+    db: Session
 ):
-    """执行接口（POST请求）"""
+    """
+    执行接口（GET/POST共用）
+    
+    Args:
+        config_id: 接口配置ID
+        request: 请求对象
+        body: 请求体参数（GET请求为空字典）
+        page: 页码（可选）
+        page_size: 每页大小（可选）
+        current_user: 当前用户
+        db: 本地数据库会话
+    """
     try:
-        # 获取接口配置
-        interface_config = db.query(InterfaceConfig).filter(
-            InterfaceConfig.id == config_id,
-            InterfaceConfig.user_id == current_user.id
-        ).first()
+        # 获取接口配置及数据库配置（带缓存）
+        interface_config, db_config = _load_exec_context(config_id, current_user.id, db)
         
         if not interface_config:
             raise HTTPException(status_code=404, detail="接口配置不存在")
@@ -815,14 +845,11 @@ async def execute_interface_post(
         if not check_blacklist(interface_config, client_ip):
             raise HTTPException(status_code=403, detail="您的IP已被加入黑名单")
         
-        # 检查限流
-        if not check_rate_limit(interface_config, client_ip):
-            raise HTTPException(status_code=429, detail="请求过于频繁，请稍后再试")
-        
-        # 获取数据库配置
-        db_config = db.query(DatabaseConfig).filter(
-            DatabaseConfig.id == interface_config.database_config_id
-        ).first()
+        # 检查限流（限流器使用同步Redis客户端，放入线程池执行避免Redis响应慢时阻塞事件循环）
+        if interface_config.enable_rate_limit:
+            allowed, retry_after = await run_in_threadpool(check_rate_limit, interface_config, client_ip)
+            if not allowed:
+                raise HTTPException(status_code=429, detail="请求过于频繁，请稍后再试", headers={"Retry-After": str(retry_after)})
         
         if not db_config:
             raise HTTPException(status_code=404, detail="数据库配置不存在")
@@ -835,48 +862,32 @@ async def execute_interface_post(
             except:
                 raise HTTPException(status_code=401, detail="需要认证")
         
-        # 获取参数（从请求体和query params）
-        params = body or {}
-        # 合并query参数
-        query_params = dict(request.query_params)
-        params.update(query_params)
-        
-        # 处理分页参数：优先使用 pageNumber/pageSize，兼容 page/page_size
-        actual_page = pageNumber if pageNumber is not None else page
-        actual_page_size = pageSize if pageSize is not None else page_size
+        # 只提取SQL中用到的参数（query参数优先于请求体，分页参数不传递给SQL）
+        query_params = request.query_params
+        params = {}
+        for name in _get_param_names(interface_config):
+            if name in query_params:
+                params[name] = query_params[name]
+            elif name in body:
+                params[name] = body[name]
         
         # 如果启用分页，使用分页参数；否则使用最大查询数量限制
         if interface_config.enable_pagination:
             # 分页模式：使用 pageNumber 和 pageSize
-            if actual_page is None:
-                actual_page = 1
-            if actual_page_size is None:
-                actual_page_size = 10
-            # 移除分页参数，避免传递给SQL
-            params.pop("pageNumber", None)
-            params.pop("pageSize", None)
-            params.pop("page", None)
-            params.pop("page_size", None)
+            actual_page = page if page is not None else 1
+            actual_page_size = page_size if page_size is not None else 10
         else:
             # 非分页模式：使用 max_query_count 限制
             actual_page = None
             actual_page_size = None
-            # 移除分页参数
-            params.pop("pageNumber", None)
-            params.pop("pageSize", None)
-            params.pop("page", None)
-            params.pop("page_size", None)
-        
-        # 执行SQL（带超时控制）
-        import threading
         
-        result = None
-        error_occurred = threading.Event()
-        
-        def execute_with_timeout():
-            nonlocal result
-            try:
-                result = execute_interface_sql(
+        # 执行SQL（带超时控制）：在共享线程池中执行，超时后立即返回504，
+        # 数据库端的语句超时（MAX_EXECUTION_TIME/statement_timeout）负责终止仍在执行的查询
+        timeout = interface_config.timeout_seconds if interface_config.timeout_seconds and interface_config.timeout_seconds > 0 else None
+        try:
+            result = await asyncio.wait_for(
+                run_in_threadpool(
+                    execute_interface_sql,
                     interface_config,
                     db_config,
                     params,
@@ -884,40 +895,19 @@ async def execute_interface_post(
                     actual_page_size,
                     client_ip,
                     current_user.id if current_user else None
-                )
-            except Exception as e:
-                error_occurred.set()
-                raise e
-        
-        # 如果启用了超时设置
-        if interface_config.timeout_seconds and interface_config.timeout_seconds > 0:
-            thread = threading.Thread(target=execute_with_timeout)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=interface_config.timeout_seconds)
-            
-            if thread.is_alive():
-                raise HTTPException(status_code=504, detail=f"请求超时（超过{interface_config.timeout_seconds}秒）")
-            
-            if error_occurred.is_set():
-                raise HTTPException(status_code=500, detail="执行失败")
-        else:
-            result = execute_interface_sql(
-                interface_config,
-                db_config,
-                params,
-                actual_page,
-                actual_page_size,
-                client_ip,
-                current_user.id if current_user else None
+                ),
+                timeout=timeout
             )
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail=f"请求超时（超过{interface_config.timeout_seconds}秒）")
         
-        # 构建响应
-        response_data = ResponseModel(
-            success=True,
-            message="success",
-            data=result
-        )
+        # 构建响应：信封由服务端构造，字段固定，直接用字典交给orjson序列化，不经过ResponseModel实例化和校验
+        response_data = {
+            "success": True,
+            "message": "success",
+            "data": result,
+            "pagination": None
+        }
         
         # 构建响应头
         headers = {}
@@ -939,7 +929,6 @@ async def execute_interface_post(
         
         # 添加自定义HTTP响应头
         try:
-            from app.models import InterfaceHeader
             response_headers = db.query(InterfaceHeader).filter(
                 InterfaceHeader.interface_config_id == interface_config.id,
                 InterfaceHeader.name.like("Response-%")
@@ -951,14 +940,7 @@ async def execute_interface_post(
         except Exception as e:
             logger.warning("获取响应头失败: {}", e)
         
-        # 如果有响应头，返回JSONResponse，否则返回普通ResponseModel
-        if headers:
-            return JSONResponse(
-                content=response_data.dict(),
-                headers=headers
-            )
-        
-        return response_data
+        return ORJSONResponse(content=response_data, headers=headers or None)
     except HTTPException:
         raise
     except ValueError as e:
@@ -975,3 +957,48 @@ async def execute_interface_post(
             detail=f"执行接口失败: {str(e)}"
         )
 
+
+
+@router.get("/{config_id}/execute", response_model=ResponseModel)
+async def execute_interface_get(
+    config_id: int,
+    request: Request,
+    pageNumber: Optional[int] = Query(None, ge=1, alias="pageNumber"),
+    pageSize: Optional[int] = Query(None, ge=1, le=1000, alias="pageSize"),
+    # 兼容旧参数名
+    page: Optional[int] = Query(None, ge=1),
+    page_size: Optional[int] = Query(None, ge=1, le=1000),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_local_db)
+):
+    """执行接口（GET请求）"""
+    # 优先使用 pageNumber/pageSize，兼容 page/page_size
+    return await _run_interface(
+        config_id, request, {},
+        pageNumber if pageNumber is not None else page,
+        pageSize if pageSize is not None else page_size,
+        current_user, db
+    )
+
+
+@router.post("/{config_id}/execute", response_model=ResponseModel)
+async def execute_interface_post(
+    config_id: int,
+    request: Request,
+    body: Dict[str, Any] = Body(None),
+    pageNumber: Optional[int] = Query(None, ge=1, alias="pageNumber"),
+    pageSize: Optional[int] = Query(None, ge=1, le=1000, alias="pageSize"),
+    # 兼容旧参数名
+    page: Optional[int] = Query(None, ge=1),
+    page_size: Optional[int] = Query(None, ge=1, le=1000),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_local_db)
+):
+    """执行接口（POST请求）"""
+    # 优先使用 pageNumber/pageSize，兼容 page/page_size
+    return await _run_interface(
+        config_id, request, body or {},
+        pageNumber if pageNumber is not None else page,
+        pageSize if pageSize is not None else page_size,
+        current_user, db
+    )
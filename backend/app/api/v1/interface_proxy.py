@@ -4,6 +4,7 @@
 from fastapi import APIRouter, Request, HTTPException, Depends, Query, Body
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any
 from app.core.database import get_local_db
 from app.models import InterfaceConfig, DatabaseConfig
@@ -106,9 +107,11 @@ async def proxy_interface(
             if not check_blacklist(interface_config, client_ip):
                 raise HTTPException(status_code=403, detail="您的IP已被加入黑名单")
         
-        # 检查限流
-        if not check_rate_limit(interface_config, client_ip):
-            raise HTTPException(status_code=429, detail="请求过于频繁，请稍后再试")
+        # 检查限流（限流器使用同步Redis客户端，放入线程池执行避免Redis响应慢时阻塞事件循环）
+        if interface_config.enable_rate_limit:
+            allowed, retry_after = await run_in_threadpool(check_rate_limit, interface_config, client_ip)
+            if not allowed:
+                raise HTTPException(status_code=429, detail="请求过于频繁，请稍后再试", headers={"Retry-After": str(retry_after)})
         
         # 检查认证
         current_user = None
@@ -2,63 +2,195 @@
 表配置路由（兼容旧接口）
 注意：当前系统主要使用 interface_configs，此路由用于兼容前端调用
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import Optional
-from app.core.database import get_local_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.requests import Request
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
+from app.core.database import get_async_local_db
 from app.models import User, InterfaceConfig, DatabaseConfig
 from app.schemas import ResponseModel
 from app.core.security import get_current_active_user
+from app.core.cache import get_cache_service
 from loguru import logger
 
 router = APIRouter(prefix="/api/v1/table-configs", tags=["表配置"])
 
+# 列表响应缓存时间（秒）
+_LIST_CACHE_TTL = 15
+
+# 进程内一级缓存：{(用户ID, enabled, 页码, 每页数量): (过期时间, ETag, 响应JSON文本)}
+# 前端轮询时直接命中，省去访问Redis的网络往返；TTL很短，多进程部署下其他进程的失效最多延迟这么久
+_LOCAL_LIST_CACHE: Dict[Tuple[int, Optional[bool], int, int], Tuple[float, str, str]] = {}
+_LOCAL_LIST_CACHE_TTL = 5
+_LOCAL_LIST_CACHE_MAXSIZE = 2048
+
+# 流式导出时每批从数据库读取的行数
+_EXPORT_BATCH_SIZE = 1000
+
+
+def _list_cache_key(user_id: int, enabled: Optional[bool], page: int, page_size: int) -> str:
+    """表配置列表缓存键"""
+    return f"tblcfg:{user_id}:{enabled}:{page}:{page_size}"
+
+
+def _list_statements(user_id: int, enabled: Optional[bool], offset: int, limit: int):
+    """
+    构造列表查询与计数查询
+    使用lambda_stmt，SQL结构按lambda所在代码位置缓存编译结果，每次请求只替换绑定参数
+    
+    Returns:
+        (列表查询, 计数查询) 元组
+    """
+    # 计数只依赖interface_configs上的过滤条件：不做JOIN、不排序，可直接走(user_id, status, created_at)索引
+    count_stmt = lambda_stmt(lambda: select(func.count(InterfaceConfig.id)))
+    count_stmt = _apply_list_filters(count_stmt, user_id, enabled)
+    stmt = _list_select(user_id, enabled)
+    stmt += lambda s: s.order_by(InterfaceConfig.created_at.desc()).offset(offset).limit(limit)
+    return stmt, count_stmt
+
+
+def _list_select(user_id: int, enabled: Optional[bool]) -> StatementLambdaElement:
+    """构造带过滤条件的列表查询（不含排序和分页）"""
+    # 查询接口配置，转换为表配置格式；通过LEFT JOIN一次性取回数据库配置名称，避免逐行查询DatabaseConfig
+    # 只查询需要的列，返回元组行而不构造ORM对象
+    stmt = lambda_stmt(lambda: select(
+        InterfaceConfig.id,
+        InterfaceConfig.table_name,
+        InterfaceConfig.interface_name,
+        InterfaceConfig.status,
+        InterfaceConfig.created_at,
+        InterfaceConfig.updated_at,
+        InterfaceConfig.database_config_id,
+        DatabaseConfig.name
+    ).outerjoin(
+        DatabaseConfig, DatabaseConfig.id == InterfaceConfig.database_config_id
+    ))
+    return _apply_list_filters(stmt, user_id, enabled)
+
+
+def _apply_list_filters(stmt: StatementLambdaElement, user_id: int, enabled: Optional[bool]) -> StatementLambdaElement:
+    """追加用户过滤条件；指定了 enabled 参数时根据 status 过滤"""
+    stmt += lambda s: s.where(InterfaceConfig.user_id == user_id)
+    if enabled is not None:
+        if enabled:
+            stmt += lambda s: s.where(InterfaceConfig.status == "active")
+        else:
+            stmt += lambda s: s.where(InterfaceConfig.status != "active")
+    return stmt
+
+
+def _to_table_configs(rows) -> List[Dict[str, Any]]:
+    """将查询结果行转换为表配置格式"""
+    return [
+        {
+            "id": config_id,
+            "name": table_name or interface_name,  # 使用表名或接口名
+            "database": database_name or "",
+            "database_id": database_config_id,
+            "enabled": config_status == "active",
+            "status": config_status,
+            "created_at": created_at,
+            "updated_at": updated_at
+        }
+        for config_id, table_name, interface_name, config_status, created_at, updated_at, database_config_id, database_name in rows
+    ]
+
+
+def _set_local_cache(key: Tuple[int, Optional[bool], int, int], etag: str, body: str, now: float):
+    """写入进程内一级缓存"""
+    if key not in _LOCAL_LIST_CACHE and len(_LOCAL_LIST_CACHE) >= _LOCAL_LIST_CACHE_MAXSIZE:
+        # 超出容量时淘汰最早写入的条目
+        _LOCAL_LIST_CACHE.pop(next(iter(_LOCAL_LIST_CACHE)), None)
+    _LOCAL_LIST_CACHE[key] = (now + _LOCAL_LIST_CACHE_TTL, etag, body)
+
+
+def _json_response(request: Request, etag: str, body: str) -> Response:
+    """
+    返回列表JSON响应并附带ETag；客户端的If-None-Match与ETag一致时直接返回304
+    max-age与进程内缓存的TTL一致，浏览器在此期间内的轮询无需请求服务端
+    """
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={_LOCAL_LIST_CACHE_TTL}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in candidates or etag in candidates:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def invalidate_table_configs_cache(user_id: int):
+    """接口配置或数据库配置变更后清除该用户的表配置列表缓存"""
+    for key in [key for key in list(_LOCAL_LIST_CACHE) if key[0] == user_id]:
+        _LOCAL_LIST_CACHE.pop(key, None)
+    try:
+        # CacheService为同步客户端（SCAN+DEL），放入线程池执行避免阻塞事件循环
+        await run_in_threadpool(get_cache_service().clear, f"tblcfg:{user_id}:*")
+    except Exception as e:
+        logger.warning("清除表配置列表缓存失败: {}", e)
+
 
 @router.get("", response_model=ResponseModel)
 @router.get("/", response_model=ResponseModel)
 async def list_configs(
+    request: Request,
     enabled: Optional[bool] = Query(None),
+    page: int = Query(1, ge=1, description="页码"),
+    page_size: int = Query(20, ge=1, le=100, description="每页数量"),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_local_db)
+    db: AsyncSession = Depends(get_async_local_db)
 ):
     """
-    获取表配置列表
+    获取表配置列表（支持分页）
     注意：此接口返回基于 interface_configs 的数据，用于兼容前端
     """
+    local_key = (current_user.id, enabled, page, page_size)
+    now = time.monotonic()
+    local_cached = _LOCAL_LIST_CACHE.get(local_key)
+    if local_cached is not None and local_cached[0] > now:
+        return _json_response(request, local_cached[1], local_cached[2])
+    
+    cache_service = get_cache_service()
+    cache_key = _list_cache_key(current_user.id, enabled, page, page_size)
+    # 缓存的是已序列化的JSON文本及其ETag，命中时直接返回，无需再校验和序列化；
+    # CacheService为同步客户端，读写均放入线程池执行
+    cached = await run_in_threadpool(cache_service.get, cache_key)
+    if cached is not None:
+        _set_local_cache(local_key, cached["etag"], cached["body"], now)
+        return _json_response(request, cached["etag"], cached["body"])
+    
     try:
-        # 查询接口配置，转换为表配置格式
-        query = db.query(InterfaceConfig).filter(InterfaceConfig.user_id == current_user.id)
-        
-        # 如果指定了 enabled 参数，根据 status 过滤
-        if enabled is not None:
-            if enabled:
-                query = query.filter(InterfaceConfig.status == "active")
-            else:
-                query = query.filter(InterfaceConfig.status != "active")
+        # 分页在数据库中完成，只取回当前页的数据
+        stmt, count_stmt = _list_statements(current_user.id, enabled, (page - 1) * page_size, page_size)
+        total = await db.scalar(count_stmt) or 0
+        rows = (await db.execute(stmt)).all()
         
-        configs = query.order_by(InterfaceConfig.created_at.desc()).all()
+        result = _to_table_configs(rows)
         
-        result = []
-        for config in configs:
-            db_config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config.database_config_id).first()
-            
-            # 转换为表配置格式
-            result.append({
-                "id": config.id,
-                "name": config.table_name or config.interface_name,  # 使用表名或接口名
-                "database": db_config.name if db_config else "",
-                "database_id": config.database_config_id,
-                "enabled": config.status == "active",
-                "status": config.status,
-                "created_at": config.created_at.isoformat() if config.created_at else None,
-                "updated_at": config.updated_at.isoformat() if config.updated_at else None
-            })
-        
-        return ResponseModel(
-            success=True,
-            message="获取成功",
-            data=result
-        )
+        # 数据已是最终结构，直接由orjson序列化（datetime原生输出ISO格式），跳过ResponseModel校验
+        body = orjson.dumps({
+            "success": True,
+            "message": "获取成功",
+            "data": result,
+            "pagination": {
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "pages": (total + page_size - 1) // page_size
+            }
+        })
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        body = body.decode("utf-8")
+        cached = {"etag": etag, "body": body}
+        await run_in_threadpool(cache_service.set, cache_key, cached, _LIST_CACHE_TTL)
+        _set_local_cache(local_key, etag, body, now)
+        return _json_response(request, etag, body)
     except Exception as e:
         logger.error("获取表配置列表失败: {}", e, exc_info=True)
         raise HTTPException(
@@ -66,3 +198,32 @@ async def list_configs(
             detail=f"获取表配置列表失败: {str(e)}"
         )
 
+
+@router.get("/export")
+async def export_configs(
+    enabled: Optional[bool] = Query(None),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_local_db)
+):
+    """
+    流式导出全部表配置（NDJSON，每行一个JSON对象）
+    使用服务端游标分批读取，内存占用与配置总数无关
+    """
+    stmt = _list_select(current_user.id, enabled)
+    stmt += lambda s: s.order_by(InterfaceConfig.created_at.desc())
+    
+    async def generate():
+        try:
+            result = await db.stream(stmt, execution_options={"yield_per": _EXPORT_BATCH_SIZE})
+            async for rows in result.partitions():
+                yield b"".join(orjson.dumps(item) + b"\n" for item in _to_table_configs(rows))
+        except Exception as e:
+            # 响应头已发出，无法再返回错误状态码，只能记录日志并中断输出
+            logger.error("导出表配置失败: {}", e, exc_info=True)
+            raise
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=table_configs.ndjson"}
+    )
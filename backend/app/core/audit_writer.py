@@ -0,0 +1,104 @@
+"""
+审计日志写入模块
+接口执行时只将审计记录放入队列，由后台线程攒批后以一次多行INSERT写入本地数据库，避免每个请求一次写库往返
+"""
+import atexit
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+# 队列容量、单批最大条数、攒批的最长等待时间（秒）
+_QUEUE_SIZE = 10000
+_BATCH_SIZE = 64
+_FLUSH_INTERVAL = 2.0
+
+_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=_QUEUE_SIZE)
+# 通知后台线程退出的哨兵
+_STOP: Dict[str, Any] = {}
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def enqueue(record: Dict[str, Any]):
+    """
+    提交一条审计记录（非阻塞，队列已满时丢弃新记录）
+
+    Args:
+        record: 与audit_logs表列对应的字段字典
+    """
+    _ensure_worker()
+    try:
+        _queue.put_nowait(record)
+    except queue.Full:
+        logger.warning("审计日志队列已满，丢弃记录: 接口ID {}", record.get("interface_id"))
+
+
+def _ensure_worker():
+    """按需启动后台写入线程"""
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run_worker, name="audit-log-writer", daemon=True)
+            _worker.start()
+
+
+def _write(batch: List[Dict[str, Any]]):
+    """批量写入审计记录（executemany，MySQL驱动会改写为多行VALUES）"""
+    from app.core.database import local_engine
+    from app.models import AuditLog
+
+    try:
+        with local_engine.begin() as conn:
+            conn.execute(AuditLog.__table__.insert(), batch)
+        logger.debug("已写入 {} 条审计日志", len(batch))
+    except Exception as e:
+        # 审计日志写入失败不影响主流程
+        logger.error("批量写入审计日志失败（{} 条）: {}", len(batch), e)
+
+
+def _run_worker():
+    """后台线程：以第一条记录开始攒批，凑满_BATCH_SIZE条或等待超过_FLUSH_INTERVAL秒即写入"""
+    while True:
+        first = _queue.get()
+        if first is _STOP:
+            return
+        batch = [first]
+        stopping = False
+        while len(batch) < _BATCH_SIZE:
+            try:
+                record = _queue.get(timeout=_FLUSH_INTERVAL)
+            except queue.Empty:
+                break
+            if record is _STOP:
+                stopping = True
+                break
+            batch.append(record)
+        _write(batch)
+        if stopping:
+            return
+
+
+def _flush_on_exit():
+    """进程退出时停止后台线程（写出其正在攒的批次），再同步写出队列中剩余的记录"""
+    if _worker is not None and _worker.is_alive():
+        try:
+            _queue.put(_STOP, timeout=1)
+            _worker.join(timeout=10)
+        except queue.Full:
+            pass
+    batch = []
+    while True:
+        try:
+            record = _queue.get_nowait()
+        except queue.Empty:
+            break
+        if record is not _STOP:
+            batch.append(record)
+    for start in range(0, len(batch), _BATCH_SIZE):
+        _write(batch[start:start + _BATCH_SIZE])
+
+
+atexit.register(_flush_on_exit)
@@ -2,6 +2,7 @@
 缓存服务模块
 提供SQL生成结果缓存、查询结果缓存等功能
 """
+import fnmatch
 import hashlib
 import json
 import threading
@@ -292,7 +293,7 @@ class CacheService:
         清空缓存
         
         Args:
-            pattern: 键模式（仅Redis支持），如果为None则清空所有
+            pattern: 键模式（Redis通配符语法，如 prefix:*），如果为None则清空所有
             
         Returns:
             删除的键数量
@@ -300,9 +301,17 @@ class CacheService:
         if self.redis_client:
             try:
                 if pattern:
-                    keys = self.redis_client.keys(pattern)
-                    if keys:
-                        return self.redis_client.delete(*keys)
+                    # 使用SCAN增量遍历，避免KEYS阻塞Redis
+                    count = 0
+                    batch = []
+                    for key in self.redis_client.scan_iter(match=pattern, count=500):
+                        batch.append(key)
+                        if len(batch) >= 500:
+                            count += self.redis_client.delete(*batch)
+                            batch = []
+                    if batch:
+                        count += self.redis_client.delete(*batch)
+                    return count
                 else:
                     # 清空当前数据库
                     self.redis_client.flushdb()
@@ -312,13 +321,12 @@ class CacheService:
                 return 0
         else:
             if pattern:
-                # 内存缓存不支持模式匹配，只支持精确匹配
-                count = 0
-                keys_to_delete = [k for k in self.memory_cache.keys() if pattern in k]
-                for key in keys_to_delete:
-                    del self.memory_cache[key]
-                    count += 1
-                return count
+                # 内存缓存按与Redis相同的通配符规则匹配
+                with self._cache_lock:
+                    keys_to_delete = [k for k in self.memory_cache.keys() if fnmatch.fnmatchcase(k, pattern)]
+                    for key in keys_to_delete:
+                        del self.memory_cache[key]
+                return len(keys_to_delete)
             else:
                 # 内存缓存（线程安全）
                 with self._cache_lock:
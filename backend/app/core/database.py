@@ -4,8 +4,9 @@
 from sqlalchemy import create_engine, MetaData, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, AsyncGenerator
 from app.core.config import settings
 from loguru import logger
 
@@ -37,6 +38,7 @@ if local_db_type == "postgresql":
         pool_recycle=settings.DB_POOL_RECYCLE,
         pool_size=settings.LOCAL_DB_POOL_SIZE,
         max_overflow=settings.LOCAL_DB_MAX_OVERFLOW,
+        query_cache_size=settings.LOCAL_DB_QUERY_CACHE_SIZE,
         echo=settings.DEBUG,
         connect_args={
             "connect_timeout": 10,
@@ -50,6 +52,7 @@ elif local_db_type == "mysql":
         pool_recycle=settings.DB_POOL_RECYCLE,
         pool_size=settings.LOCAL_DB_POOL_SIZE,
         max_overflow=settings.LOCAL_DB_MAX_OVERFLOW,
+        query_cache_size=settings.LOCAL_DB_QUERY_CACHE_SIZE,
         echo=settings.DEBUG,
         connect_args={
             "connect_timeout": 10,
@@ -60,6 +63,20 @@ elif local_db_type == "mysql":
 else:
     raise ValueError(f"不支持的本地数据库类型: {local_db_type}，支持的类型: mysql, postgresql")
 
+# 创建本地数据库异步引擎（用于高频读写的配置类路由，避免同步查询阻塞事件循环）
+# MySQL使用asyncmy，PostgreSQL使用asyncpg
+local_async_engine = create_async_engine(
+    settings.local_async_database_url,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.LOCAL_DB_POOL_SIZE,
+    max_overflow=settings.LOCAL_DB_MAX_OVERFLOW,
+    # 接口配置等路由的select()语句按结构缓存编译结果，过滤值均通过绑定参数传入
+    query_cache_size=settings.LOCAL_DB_QUERY_CACHE_SIZE,
+    echo=settings.DEBUG,
+    connect_args={"timeout": 10} if local_db_type == "postgresql" else {"connect_timeout": 10}
+)
+
 # 为了向后兼容，保留 engine 作为目标数据库引擎
 engine = target_engine
 
@@ -70,6 +87,9 @@ TargetSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=target
 # 本地数据库会话（用于服务自身数据存储）
 LocalSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=local_engine)
 
+# 本地数据库异步会话（提交后不过期对象，便于在响应中继续读取属性）
+AsyncLocalSessionLocal = async_sessionmaker(local_async_engine, autoflush=False, expire_on_commit=False)
+
 # 为了向后兼容，保留 SessionLocal 作为本地数据库会话（用户表等）
 SessionLocal = LocalSessionLocal
 
@@ -104,6 +124,21 @@ def get_local_db() -> Generator[Session, None, None]:
     yield from get_db()
 
 
+async def get_async_local_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    获取本地数据库异步会话的依赖注入函数（用于配置表等）
+    """
+    async with AsyncLocalSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            # 确保错误信息不为空
+            error_msg = str(e) if e and str(e) else (repr(e) if e else type(e).__name__ if e else "Unknown error")
+            logger.error("本地数据库异步会话错误: {}", error_msg, exc_info=True)
+            await db.rollback()
+            raise
+
+
 def get_target_db() -> Generator[Session, None, None]:
     """
     获取目标数据库会话的依赖注入函数（用于表转服务）
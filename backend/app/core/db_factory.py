@@ -4,13 +4,26 @@
 """
 from sqlalchemy import create_engine, Engine, text
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
 from urllib.parse import quote_plus
 from typing import Optional, Dict, Any
+import atexit
+import hashlib
 import threading
 from app.models import DatabaseConfig
+from app.core.config import settings
 from app.core.password_encryption import decrypt_password
 from loguru import logger
 
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine
+    import asyncmy  # noqa: F401  # MySQL异步驱动（Cython实现）
+    ASYNCMY_AVAILABLE = True
+except ImportError:
+    ASYNCMY_AVAILABLE = False
+    logger.debug("asyncmy未安装，MySQL连接测试将在线程池中使用pymysql执行")
+
 
 class DatabaseConnectionFactory:
     """数据库连接工厂类"""
@@ -39,14 +52,14 @@ class DatabaseConnectionFactory:
         Returns:
             缓存键字符串
         """
-        # 使用配置ID和连接URL的组合作为缓存键
-        # 如果配置ID存在，使用ID；否则使用连接URL的哈希
+        # 如果配置ID存在，使用ID和更新时间（配置修改后自动使用新引擎）；否则使用连接URL的哈希
         if hasattr(db_config, 'id') and db_config.id:
-            return f"db_config_{db_config.id}"
+            updated_at = getattr(db_config, 'updated_at', None)
+            version = int(updated_at.timestamp() * 1000000) if updated_at else 0
+            return f"db_config_{db_config.id}_{version}"
         else:
             # 使用连接URL作为缓存键
             db_url = cls.get_connection_url(db_config)
-            import hashlib
             url_hash = hashlib.md5(db_url.encode('utf-8')).hexdigest()
             return f"db_url_{url_hash}"
     
@@ -150,25 +163,11 @@ class DatabaseConnectionFactory:
         # 生成缓存键
         cache_key = cls._get_cache_key(db_config)
         
-        # 检查缓存
+        # 检查缓存（失效连接由pool_pre_ping在取出时检测并重连，命中时无需再执行SELECT 1）
         with cls._cache_lock:
-            if cache_key in cls._engine_cache:
-                cached_engine = cls._engine_cache[cache_key]
-                # 验证引擎是否仍然有效
-                try:
-                    # 尝试连接以验证引擎是否有效
-                    with cached_engine.connect() as conn:
-                        conn.execute(text("SELECT 1"))
-                    logger.debug(f"使用缓存的数据库引擎: {cache_key}")
-                    return cached_engine
-                except Exception as e:
-                    # 引擎无效，从缓存中移除
-                    logger.warning(f"缓存的引擎无效，将重新创建: {e}")
-                    try:
-                        cached_engine.dispose()
-                    except Exception:
-                        pass
-                    del cls._engine_cache[cache_key]
+            cached_engine = cls._engine_cache.get(cache_key)
+        if cached_engine is not None:
+            return cached_engine
         
         # 缓存未命中或引擎无效，创建新引擎
         db_url = cls.get_connection_url(db_config)
@@ -182,7 +181,6 @@ class DatabaseConnectionFactory:
         }
         
         # 从配置中获取连接池参数（如果可用）
-        from app.core.config import settings
         default_pool_size = getattr(settings, 'DB_POOL_SIZE', 10)
         default_max_overflow = getattr(settings, 'DB_MAX_OVERFLOW', 20)
         default_pool_recycle = getattr(settings, 'DB_POOL_RECYCLE', 3600)
@@ -236,10 +234,26 @@ class DatabaseConnectionFactory:
             engine = create_engine(db_url, **default_kwargs)
             logger.debug(f"创建数据库引擎成功: {db_type} - {db_config.name}")
             
-            # 缓存引擎
+            # 缓存引擎，并释放同一配置修改前的旧引擎
+            stale_engines = []
             with cls._cache_lock:
-                cls._engine_cache[cache_key] = engine
-                logger.debug(f"数据库引擎已缓存: {cache_key} (当前缓存数量: {len(cls._engine_cache)})")
+                cached_engine = cls._engine_cache.get(cache_key)
+                if cached_engine is not None:
+                    # 其他线程已并发创建了该引擎，使用已缓存的引擎
+                    stale_engines.append(engine)
+                    engine = cached_engine
+                else:
+                    if cache_key.startswith("db_config_"):
+                        id_prefix = f"db_config_{db_config.id}_"
+                        for key in [k for k in cls._engine_cache if k.startswith(id_prefix)]:
+                            stale_engines.append(cls._engine_cache.pop(key))
+                    cls._engine_cache[cache_key] = engine
+                    logger.debug(f"数据库引擎已缓存: {cache_key} (当前缓存数量: {len(cls._engine_cache)})")
+            for stale_engine in stale_engines:
+                try:
+                    stale_engine.dispose()
+                except Exception as e:
+                    logger.warning(f"释放旧数据库引擎时出错: {e}")
             
             return engine
         except Exception as e:
@@ -302,6 +316,60 @@ class DatabaseConnectionFactory:
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
         return SessionLocal()
     
+    @classmethod
+    def get_async_connection_url(cls, db_config: DatabaseConfig) -> Optional[str]:
+        """
+        生成异步驱动的连接URL（目前仅MySQL使用asyncmy）
+        
+        Args:
+            db_config: 数据库配置对象
+            
+        Returns:
+            异步连接URL；不支持异步驱动时返回None
+        """
+        db_type = (db_config.db_type or "mysql").lower()
+        if db_type != "mysql" or not ASYNCMY_AVAILABLE:
+            return None
+        url = cls.get_connection_url(db_config)
+        return url.replace("mysql+pymysql://", "mysql+asyncmy://", 1)
+    
+    @classmethod
+    def _test_connection_sync(cls, db_config: DatabaseConfig) -> None:
+        """使用同步引擎测试连接（失败时抛出异常）"""
+        engine = cls.create_engine(db_config)
+        test_sql = cls.get_test_sql(db_config.db_type or "mysql")
+        with engine.connect() as conn:
+            conn.execute(text(test_sql))
+        engine.dispose()
+    
+    @classmethod
+    async def test_connection_async(cls, db_config: DatabaseConfig) -> None:
+        """
+        异步测试数据库连接（失败时抛出异常）
+        
+        MySQL且安装了asyncmy时直接在事件循环中完成握手和SELECT 1；
+        其他数据库类型在线程池中使用同步引擎测试，避免阻塞事件循环。
+        
+        Args:
+            db_config: 数据库配置对象
+        """
+        async_url = cls.get_async_connection_url(db_config)
+        if not async_url:
+            await run_in_threadpool(cls._test_connection_sync, db_config)
+            return
+        
+        # 连接测试只需一次握手，不需要连接池
+        engine = create_async_engine(
+            async_url,
+            poolclass=NullPool,
+            connect_args={"connect_timeout": 15},
+        )
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text(cls.get_test_sql(db_config.db_type or "mysql")))
+        finally:
+            await engine.dispose()
+    
     @classmethod
     def get_test_sql(cls, db_type: str) -> str:
         """
@@ -354,3 +422,5 @@ class DatabaseConnectionFactory:
         return type_info["default_port"] if type_info else None
 
 
+# 进程退出时释放所有缓存的数据库引擎
+atexit.register(DatabaseConnectionFactory.clear_engine_cache)
@@ -0,0 +1,146 @@
+"""
+调试日志模块
+将调试埋点日志（JSON Lines）放入队列，由后台线程批量写入文件，避免在请求/探查路径上同步打开和写入文件
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+try:
+    import orjson
+
+    def _dumps(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    import json
+
+    def _dumps(record: Dict[str, Any]) -> bytes:
+        return json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+
+# 是否启用调试日志（导入时读取一次，未启用时emit只做一次布尔判断）
+DEBUG_LOG_ENABLED = os.getenv("DEBUG_LOG_ENABLED", "false").lower() == "true"
+DEBUG_LOG_PATH = os.getenv("DEBUG_LOG_PATH", "/opt/table_to_service/.cursor/debug.log")
+
+# 队列容量、单批最大条数、空闲时的最长等待时间（秒）
+_QUEUE_SIZE = 4096
+_BATCH_SIZE = 64
+_FLUSH_INTERVAL = 2.0
+
+_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=_QUEUE_SIZE)
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def emit(location: str, message: str, data: Dict[str, Any], hypothesis_id: Optional[str] = None):
+    """
+    记录一条调试日志（非阻塞）
+
+    Args:
+        location: 埋点位置
+        message: 日志消息
+        data: 附加数据
+        hypothesis_id: 调试假设标识（可选）
+    """
+    if not DEBUG_LOG_ENABLED:
+        return
+
+    record = {
+        "sessionId": "debug-session",
+        "runId": "run1",
+        "hypothesisId": hypothesis_id,
+        "location": location,
+        "message": message,
+        "data": data,
+        "timestamp": int(time.time() * 1000)
+    }
+
+    _ensure_worker()
+    try:
+        _queue.put_nowait(record)
+    except queue.Full:
+        # 队列已满时丢弃最旧的记录，保证写日志不阻塞调用方
+        try:
+            _queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            _queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _ensure_worker():
+    """按需启动后台写入线程"""
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run_worker, name="debug-log-writer", daemon=True)
+            _worker.start()
+
+
+def _drain(first: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """取出一批记录（最多_BATCH_SIZE条）"""
+    batch = [first]
+    while len(batch) < _BATCH_SIZE:
+        try:
+            batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _encode(batch: List[Dict[str, Any]]) -> bytes:
+    """将一批记录编码为JSON Lines"""
+    return b"".join(_dumps(record) + b"\n" for record in batch)
+
+
+def _run_worker():
+    """后台线程：持有文件句柄，每批记录只执行一次写入"""
+    log_file = None
+    while True:
+        try:
+            first = _queue.get(timeout=_FLUSH_INTERVAL)
+        except queue.Empty:
+            continue
+        batch = _drain(first)
+        try:
+            if log_file is None:
+                log_file = open(DEBUG_LOG_PATH, "ab", buffering=0)
+            log_file.write(_encode(batch))
+        except Exception as e:
+            # 调试日志写入失败不影响主流程
+            logger.debug("写入调试日志失败: {}", e)
+            if log_file is not None:
+                try:
+                    log_file.close()
+                except Exception:
+                    pass
+                log_file = None
+
+
+def _flush_on_exit():
+    """进程退出时同步写出队列中剩余的记录"""
+    if not DEBUG_LOG_ENABLED:
+        return
+    batch = []
+    while True:
+        try:
+            batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    if not batch:
+        return
+    try:
+        with open(DEBUG_LOG_PATH, "ab") as f:
+            f.write(_encode(batch))
+    except Exception:
+        pass
+
+
+atexit.register(_flush_on_exit)
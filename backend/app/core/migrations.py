@@ -60,6 +60,16 @@ def check_column_exists(table_name: str, column_name: str, db_type: str = None)
         db.close()
 
 
+def check_index_exists(table_name: str, index_name: str) -> bool:
+    """检查索引是否存在"""
+    try:
+        inspector = inspect(local_engine)
+        return any(index["name"] == index_name for index in inspector.get_indexes(table_name))
+    except Exception as e:
+        logger.error(f"检查索引 {table_name}.{index_name} 失败: {e}")
+        return False
+
+
 def check_table_exists(table_name: str, db_type: str = None) -> bool:
     """检查表是否存在"""
     if db_type is None:
@@ -237,12 +247,65 @@ def run_migration_4_add_soft_delete():
         db.close()
 
 
+def run_migration_5_add_interface_config_list_index():
+    """迁移5: 为interface_configs添加(user_id, status, created_at DESC)复合索引"""
+    db = LocalSessionLocal()
+    try:
+        db_type = get_db_type()
+        
+        if check_table_exists('interface_configs', db_type) and \
+                not check_index_exists('interface_configs', 'ix_ic_user_status_created'):
+            logger.info("执行迁移: 添加 ix_ic_user_status_created 索引到 interface_configs 表")
+            db.execute(text("""
+                CREATE INDEX ix_ic_user_status_created
+                ON interface_configs (user_id, status, created_at DESC)
+            """))
+        
+        db.commit()
+        logger.info("迁移5完成: 接口配置列表复合索引")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"迁移5失败: {e}", exc_info=True)
+        raise
+    finally:
+        db.close()
+
+
+def run_migration_6_add_active_interface_partial_index():
+    """迁移6: 为interface_configs添加只包含已启用接口的部分索引（仅PostgreSQL）"""
+    db = LocalSessionLocal()
+    try:
+        db_type = get_db_type()
+        if db_type != 'postgresql':
+            return  # MySQL不支持部分索引，复合索引已覆盖该查询
+        
+        if check_table_exists('interface_configs', db_type) and \
+                not check_index_exists('interface_configs', 'ix_ic_user_created_active'):
+            logger.info("执行迁移: 添加 ix_ic_user_created_active 部分索引到 interface_configs 表")
+            db.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_ic_user_created_active
+                ON interface_configs (user_id, created_at DESC)
+                WHERE status = 'active'
+            """))
+        
+        db.commit()
+        logger.info("迁移6完成: 已启用接口部分索引")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"迁移6失败: {e}", exc_info=True)
+        raise
+    finally:
+        db.close()
+
+
 # 所有迁移函数列表（按执行顺序）
 MIGRATIONS: List[Callable[[], None]] = [
     run_migration_1_add_db_type_support,
     run_migration_2_add_scene_field,
     run_migration_3_add_recommended_questions,
     run_migration_4_add_soft_delete,
+    run_migration_5_add_interface_config_list_index,
+    run_migration_6_add_active_interface_partial_index,
 ]
 
 
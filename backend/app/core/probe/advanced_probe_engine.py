@@ -6,7 +6,9 @@ from typing import Dict, Any, Optional, List
 from sqlalchemy import text, inspect
 from loguru import logger
 import json
+import traceback
 
+from app.core import debug_log
 from .basic_probe_engine import BasicProbeEngine
 from .data_quality_checker import DataQualityChecker
 from .sensitive_info_detector import SensitiveInfoDetector
@@ -93,15 +95,12 @@ class AdvancedProbeEngine(BasicProbeEngine):
             表级探查结果字典
         """
         # #region agent log
-        import json, time
-        with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-            f.write(json.dumps({"location":"advanced_probe_engine.py:83","message":"advanced probe_table entry","data":{"table_name":table_name,"schema_name":schema_name},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"B"}) + '\n')
+        debug_log.emit("advanced_probe_engine.py:83", "advanced probe_table entry", {"table_name":table_name,"schema_name":schema_name}, "B")
         # #endregion
         # 先执行基础探查
         result = super().probe_table(table_name, schema_name)
         # #region agent log
-        with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-            f.write(json.dumps({"location":"advanced_probe_engine.py:97","message":"after basic probe_table","data":{"table_name":table_name,"has_row_count":result.get("row_count") is not None,"has_table_size":result.get("table_size_mb") is not None},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"B"}) + '\n')
+        debug_log.emit("advanced_probe_engine.py:97", "after basic probe_table", {"table_name":table_name,"has_row_count":result.get("row_count") is not None,"has_table_size":result.get("table_size_mb") is not None}, "B")
         # #endregion
         
         adapter = self._get_adapter()
@@ -151,15 +150,12 @@ class AdvancedProbeEngine(BasicProbeEngine):
         except Exception as e:
             logger.error(f"高级表级探查失败: {e}", exc_info=True)
             # #region agent log
-            import json, time, traceback
-            with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-                f.write(json.dumps({"location":"advanced_probe_engine.py:122","message":"advanced probe_table error","data":{"table_name":table_name,"error":str(e),"traceback":traceback.format_exc()},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"B"}) + '\n')
+            if debug_log.DEBUG_LOG_ENABLED:
+                debug_log.emit("advanced_probe_engine.py:122", "advanced probe_table error", {"table_name":table_name,"error":str(e),"traceback":traceback.format_exc()}, "B")
             # #endregion
         
         # #region agent log
-        import json, time
-        with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-            f.write(json.dumps({"location":"advanced_probe_engine.py:124","message":"advanced probe_table return","data":{"table_name":table_name,"row_count":result.get("row_count"),"table_size_mb":result.get("table_size_mb"),"has_cold_hot":result.get("is_cold_table") is not None or result.get("is_hot_table") is not None},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"B"}) + '\n')
+        debug_log.emit("advanced_probe_engine.py:124", "advanced probe_table return", {"table_name":table_name,"row_count":result.get("row_count"),"table_size_mb":result.get("table_size_mb"),"has_cold_hot":result.get("is_cold_table") is not None or result.get("is_hot_table") is not None}, "B")
         # #endregion
         return result
     
@@ -182,15 +178,12 @@ class AdvancedProbeEngine(BasicProbeEngine):
             列级探查结果字典
         """
         # #region agent log
-        import json, time
-        with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-            f.write(json.dumps({"location":"advanced_probe_engine.py:126","message":"advanced probe_column entry","data":{"table_name":table_name,"column_name":column_name,"schema_name":schema_name},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"C"}) + '\n')
+        debug_log.emit("advanced_probe_engine.py:126", "advanced probe_column entry", {"table_name":table_name,"column_name":column_name,"schema_name":schema_name}, "C")
         # #endregion
         # 先执行基础探查
         result = super().probe_column(table_name, column_name, schema_name)
         # #region agent log
-        with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-            f.write(json.dumps({"location":"advanced_probe_engine.py:145","message":"after basic probe_column","data":{"table_name":table_name,"column_name":column_name,"data_type":result.get("data_type")},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"C"}) + '\n')
+        debug_log.emit("advanced_probe_engine.py:145", "after basic probe_column", {"table_name":table_name,"column_name":column_name,"data_type":result.get("data_type")}, "C")
         # #endregion
         
         adapter = self._get_adapter()
@@ -292,15 +285,12 @@ class AdvancedProbeEngine(BasicProbeEngine):
         except Exception as e:
             logger.error(f"高级列级探查失败: {e}", exc_info=True)
             # #region agent log
-            import json, time, traceback
-            with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-                f.write(json.dumps({"location":"advanced_probe_engine.py:272","message":"advanced probe_column error","data":{"table_name":table_name,"column_name":column_name,"error":str(e),"traceback":traceback.format_exc()},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"C"}) + '\n')
+            if debug_log.DEBUG_LOG_ENABLED:
+                debug_log.emit("advanced_probe_engine.py:272", "advanced probe_column error", {"table_name":table_name,"column_name":column_name,"error":str(e),"traceback":traceback.format_exc()}, "C")
             # #endregion
         
         # #region agent log
-        import json, time
-        with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-            f.write(json.dumps({"location":"advanced_probe_engine.py:274","message":"advanced probe_column return","data":{"table_name":table_name,"column_name":column_name,"has_non_null_rate":result.get("non_null_rate") is not None,"has_distinct_count":result.get("distinct_count") is not None,"has_top_values":result.get("top_values") is not None,"top_values_count":len(result.get("top_values",[])) if result.get("top_values") else 0},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"C"}) + '\n')
+        debug_log.emit("advanced_probe_engine.py:274", "advanced probe_column return", {"table_name":table_name,"column_name":column_name,"has_non_null_rate":result.get("non_null_rate") is not None,"has_distinct_count":result.get("distinct_count") is not None,"has_top_values":result.get("top_values") is not None,"top_values_count":len(result.get("top_values",[])) if result.get("top_values") else 0}, "C")
         # #endregion
         return result
 
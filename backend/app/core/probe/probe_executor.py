@@ -9,6 +9,7 @@ from loguru import logger
 from datetime import datetime
 
 from app.models import ProbeTask, ProbeDatabaseResult, ProbeTableResult, ProbeColumnResult, DatabaseConfig
+from app.core import debug_log
 from .base_probe_engine import BaseProbeEngine
 from .basic_probe_engine import BasicProbeEngine
 from .advanced_probe_engine import AdvancedProbeEngine
@@ -62,9 +63,7 @@ class ProbeExecutor:
             
             try:
                 # #region agent log
-                import json, time
-                with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-                    f.write(json.dumps({"location":"probe_executor.py:64","message":"executing probe task","data":{"task_id":task.id,"probe_mode":task.probe_mode,"probe_level":task.probe_level,"engine_type":type(engine).__name__},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"A"}) + '\n')
+                debug_log.emit("probe_executor.py:64", "executing probe task", {"task_id":task.id,"probe_mode":task.probe_mode,"probe_level":task.probe_level,"engine_type":type(engine).__name__}, "A")
                 # #endregion
                 
                 # 根据探查级别执行不同的探查
@@ -211,14 +210,11 @@ class ProbeExecutor:
                 try:
                     schema_name = "public" if db_config.db_type == "postgresql" else None
                     # #region agent log
-                    import json, time
-                    with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-                        f.write(json.dumps({"location":"probe_executor.py:207","message":"probing table","data":{"task_id":task.id,"table_name":table_name,"probe_mode":task.probe_mode,"engine_type":type(engine).__name__},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"B"}) + '\n')
+                    debug_log.emit("probe_executor.py:207", "probing table", {"task_id":task.id,"table_name":table_name,"probe_mode":task.probe_mode,"engine_type":type(engine).__name__}, "B")
                     # #endregion
                     result = engine.probe_table(table_name, schema_name)
                     # #region agent log
-                    with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-                        f.write(json.dumps({"location":"probe_executor.py:210","message":"table probe result","data":{"task_id":task.id,"table_name":table_name,"has_row_count":result.get("row_count") is not None,"has_table_size":result.get("table_size_mb") is not None,"column_count":result.get("column_count",0)},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"B"}) + '\n')
+                    debug_log.emit("probe_executor.py:210", "table probe result", {"task_id":task.id,"table_name":table_name,"has_row_count":result.get("row_count") is not None,"has_table_size":result.get("table_size_mb") is not None,"column_count":result.get("column_count",0)}, "B")
                     # #endregion
                     
                     # 检查是否已存在该表的结果
@@ -361,14 +357,11 @@ class ProbeExecutor:
                         try:
                             column_name = column["name"]
                             # #region agent log
-                            import json, time
-                            with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-                                f.write(json.dumps({"location":"probe_executor.py:329","message":"probing column","data":{"task_id":task.id,"table_name":table_result.table_name,"column_name":column_name,"probe_mode":task.probe_mode,"engine_type":type(engine).__name__},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"C"}) + '\n')
+                            debug_log.emit("probe_executor.py:329", "probing column", {"task_id":task.id,"table_name":table_result.table_name,"column_name":column_name,"probe_mode":task.probe_mode,"engine_type":type(engine).__name__}, "C")
                             # #endregion
                             result = engine.probe_column(table_result.table_name, column_name, schema_name)
                             # #region agent log
-                            with open('/opt/table_to_service/.cursor/debug.log', 'a') as f:
-                                f.write(json.dumps({"location":"probe_executor.py:332","message":"column probe result","data":{"task_id":task.id,"table_name":table_result.table_name,"column_name":column_name,"has_non_null_rate":result.get("non_null_rate") is not None,"has_distinct_count":result.get("distinct_count") is not None,"has_top_values":result.get("top_values") is not None},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"run1","hypothesisId":"C"}) + '\n')
+                            debug_log.emit("probe_executor.py:332", "column probe result", {"task_id":task.id,"table_name":table_result.table_name,"column_name":column_name,"has_non_null_rate":result.get("non_null_rate") is not None,"has_distinct_count":result.get("distinct_count") is not None,"has_top_values":result.get("top_values") is not None}, "C")
                             # #endregion
                             
                             # 保存结果
@@ -4,7 +4,6 @@ SQL生成服务
 支持缓存机制以提升性能
 """
 import re
-import json
 from typing import Dict, Any, Optional, List
 from loguru import logger
 
@@ -12,26 +11,12 @@ from app.core.llm.base import BaseLLMClient
 from app.core.rag.prompt_builder import PromptBuilder
 from app.core.rag.schema_loader import SchemaLoader
 from app.core.cache import get_cache_service
+from app.core import debug_log
 from app.models import DatabaseConfig
 
 # #region agent log
-DEBUG_LOG_PATH = "/opt/table_to_service/.cursor/debug.log"
-def _debug_log(location, message, data, hypothesis_id=None):
-    try:
-        with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-            import time
-            log_entry = {
-                "sessionId": "debug-session",
-                "runId": "run1",
-                "hypothesisId": hypothesis_id,
-                "location": location,
-                "message": message,
-                "data": data,
-                "timestamp": int(time.time() * 1000)
-            }
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
+# 调试日志由后台线程批量写入，未启用时直接返回
+_debug_log = debug_log.emit
 # #endregion
 
 
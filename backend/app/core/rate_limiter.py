@@ -0,0 +1,96 @@
+"""
+接口限流模块
+基于GCRA（通用信元速率算法）实现限流：Redis可用时通过Lua脚本在一次往返中原子完成判断（多进程共享限额），
+Redis不可用时退化为进程内限流
+"""
+import math
+import threading
+import time
+from typing import Dict, Tuple
+from loguru import logger
+from app.core.cache import get_cache_service
+
+# KEYS[1]: 限流键  ARGV: 周期内允许的请求数, 周期（秒）, 本次消耗
+# 返回 {是否允许(1/0), 需等待的秒数}
+_GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2]) * 1000000
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + period / limit * cost
+local diff = now - (new_tat - period)
+if diff < 0 then
+    return {0, math.ceil(-diff / 1000000)}
+end
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX', math.ceil((new_tat - now) / 1000))
+return {1, 0}
+"""
+
+_script = None
+_script_client = None
+
+# 进程内限流状态：{限流键: 理论到达时间（秒）}
+_local_tat: Dict[str, float] = {}
+_local_lock = threading.Lock()
+
+
+def _get_script():
+    """获取已注册的Lua脚本（Redis不可用时返回None）"""
+    global _script, _script_client
+    client = get_cache_service().redis_client
+    if client is None:
+        return None
+    if _script is None or _script_client is not client:
+        # register_script 使用EVALSHA执行，脚本未加载时自动回退为EVAL
+        _script = client.register_script(_GCRA_SCRIPT)
+        _script_client = client
+    return _script
+
+
+def _acquire_local(key: str, limit: int, period: int, cost: int) -> Tuple[bool, int]:
+    """进程内GCRA限流"""
+    now = time.monotonic()
+    with _local_lock:
+        tat = max(_local_tat.get(key, now), now)
+        new_tat = tat + period / limit * cost
+        diff = now - (new_tat - period)
+        if diff < 0:
+            return False, math.ceil(-diff)
+        _local_tat[key] = new_tat
+        # 顺带清理已过期的状态，避免字典无限增长
+        if len(_local_tat) > 10000:
+            for expired in [k for k, v in _local_tat.items() if v <= now]:
+                del _local_tat[expired]
+    return True, 0
+
+
+def acquire(key: str, limit: int, period: int, cost: int = 1) -> Tuple[bool, int]:
+    """
+    尝试获取限流配额
+
+    Args:
+        key: 限流键
+        limit: 周期内允许的请求数
+        period: 周期（秒）
+        cost: 本次请求消耗的配额
+
+    Returns:
+        (是否允许, 需等待的秒数) 元组
+    """
+    if limit <= 0 or period <= 0:
+        return True, 0
+
+    script = _get_script()
+    if script is not None:
+        try:
+            allowed, retry_after = script(keys=[key], args=[limit, period, cost])
+            return bool(int(allowed)), int(retry_after)
+        except Exception as e:
+            logger.warning("Redis限流失败，使用进程内限流: {}", e)
+
+    return _acquire_local(key, limit, period, cost)
@@ -1,7 +1,9 @@
 """
 安全相关功能模块
 """
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -76,10 +78,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+@lru_cache(maxsize=8192)
+def _decode_token(token: str) -> dict:
+    """
+    解码并校验令牌签名（按令牌缓存，同一令牌的后续请求无需重复验签）
+    
+    过期时间在缓存命中后由verify_token单独检查；解码失败抛出的异常不会被缓存
+    """
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
 def verify_token(token: str, credentials_exception: HTTPException) -> TokenData:
     """验证令牌"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = _decode_token(token)
+        exp = payload.get("exp")
+        if exp is not None and exp < time.time():
+            logger.warning("Token已过期")
+            raise credentials_exception
         username: str = payload.get("sub")
         if username is None:
             logger.warning("Token中缺少sub字段")
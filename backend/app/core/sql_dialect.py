@@ -2,7 +2,9 @@
 SQL方言适配器
 处理不同数据库的SQL语法差异，如标识符转义、分页语法等
 """
+import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
@@ -109,7 +111,6 @@ class SQLDialectAdapter(ABC):
             COUNT查询SQL
         """
         # 简单的实现：将SELECT ... FROM替换为SELECT COUNT(*) FROM
-        import re
         # 移除ORDER BY子句（COUNT查询不需要）
         sql_no_order = re.sub(r'\s+ORDER\s+BY\s+[^;]+', '', sql, flags=re.IGNORECASE)
         # 提取FROM之后的部分
@@ -126,6 +127,7 @@ class SQLDialectAdapter(ABC):
 class MySQLAdapter(SQLDialectAdapter):
     """MySQL方言适配器"""
     
+    @lru_cache(maxsize=4096)
     def escape_identifier(self, identifier: str) -> str:
         """MySQL使用反引号转义标识符"""
         if not identifier:
@@ -169,6 +171,7 @@ class MySQLAdapter(SQLDialectAdapter):
 class PostgreSQLAdapter(SQLDialectAdapter):
     """PostgreSQL方言适配器"""
     
+    @lru_cache(maxsize=4096)
     def escape_identifier(self, identifier: str) -> str:
         """PostgreSQL使用双引号转义标识符"""
         if not identifier:
@@ -227,6 +230,7 @@ class PostgreSQLAdapter(SQLDialectAdapter):
 class SQLiteAdapter(SQLDialectAdapter):
     """SQLite方言适配器"""
     
+    @lru_cache(maxsize=4096)
     def escape_identifier(self, identifier: str) -> str:
         """SQLite可以使用方括号或反引号转义标识符"""
         if not identifier:
@@ -259,6 +263,7 @@ class SQLiteAdapter(SQLDialectAdapter):
 class SQLServerAdapter(SQLDialectAdapter):
     """SQL Server方言适配器"""
     
+    @lru_cache(maxsize=4096)
     def escape_identifier(self, identifier: str) -> str:
         """SQL Server使用方括号转义标识符"""
         if not identifier:
@@ -314,6 +319,7 @@ class SQLServerAdapter(SQLDialectAdapter):
 class OracleAdapter(SQLDialectAdapter):
     """Oracle方言适配器"""
     
+    @lru_cache(maxsize=4096)
     def escape_identifier(self, identifier: str) -> str:
         """Oracle使用双引号转义标识符（区分大小写）"""
         if not identifier:
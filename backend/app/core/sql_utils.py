@@ -2,15 +2,23 @@
 SQL执行公共工具函数
 提取interface_executor和sql_executor中的公共逻辑
 """
+import base64
+import json
 import re
-from typing import Dict, Any, List, Optional, Tuple
-from sqlalchemy import text
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.orm import Session
 from loguru import logger
 
 from app.core.sql_dialect import SQLDialectFactory
 from app.core.log_sanitizer import safe_log_sql, safe_log_params
 
+# SQL中的命名参数占位符（:name）
+_PLACEHOLDER_PATTERN = re.compile(r':(\w+)')
+
 
 def process_sql_params(
     sql: str,
@@ -59,19 +67,43 @@ def process_sql_params(
             sql = re.sub(r'\s+WHERE\s*$', '', sql, flags=re.IGNORECASE)
             sql = re.sub(r'\s+WHERE\s*;', ';', sql, flags=re.IGNORECASE)
         
-        # 构建参数化查询的参数字典（只包含SQL中实际存在的占位符）
+        # 构建参数化查询的参数字典（只包含SQL中实际存在的占位符，按名称精确匹配）
+        placeholders = set(_PLACEHOLDER_PATTERN.findall(sql))
         for key, value in params.items():
-            placeholder = f":{key}"
-            if placeholder in sql:
+            if key in placeholders:
                 query_params[key] = value
     
     return sql, query_params
 
 
+@lru_cache(maxsize=1024)
+def _compile_text(sql: str, expanding: Tuple[str, ...]) -> TextClause:
+    """构建text()对象，expanding中的参数按列表展开绑定（IN :name）"""
+    clause = text(sql)
+    if expanding:
+        placeholders = set(_PLACEHOLDER_PATTERN.findall(sql))
+        names = [name for name in expanding if name in placeholders]
+        if names:
+            clause = clause.bindparams(*(bindparam(name, expanding=True) for name in names))
+    return clause
+
+
+def build_text_clause(sql: str, query_params: Optional[Dict[str, Any]] = None) -> TextClause:
+    """
+    获取SQL对应的text()对象（按SQL缓存，重复执行同一SQL时复用SQLAlchemy的编译缓存）
+    
+    列表/元组类型的参数作为展开参数绑定，SQL中写作 IN :name
+    """
+    expanding = tuple(key for key, value in query_params.items() if isinstance(value, (list, tuple))) if query_params else ()
+    return _compile_text(sql, expanding)
+
+
 def execute_sql_query(
     db: Session,
     sql: str,
-    query_params: Optional[Dict[str, Any]] = None
+    query_params: Optional[Dict[str, Any]] = None,
+    offset: int = 0,
+    limit: Optional[int] = None
 ) -> Tuple[Any, List[str]]:
     """
     执行SQL查询（公共函数）
@@ -80,21 +112,130 @@ def execute_sql_query(
         db: 数据库会话
         sql: SQL语句
         query_params: 参数字典（可选）
+        offset: 跳过的行数（仅在指定limit时生效）
+        limit: 最多读取的行数（可选，指定时使用服务端游标流式读取，读够即停止）。
+            仅用于无法在SQL中追加LIMIT/OFFSET的情况：部分驱动（如pymysql的SSCursor）关闭游标时
+            仍会读完并丢弃剩余的行，能下推到SQL时应由调用方在SQL中限制行数
         
     Returns:
         (查询结果, 列名列表) 元组
     """
-    if query_params:
-        result = db.execute(text(sql), query_params)
+    statement = build_text_clause(sql, query_params)
+    if limit is None:
+        result = db.execute(statement, query_params or {})
+        columns = list(result.keys())
+        rows = result.fetchall()
     else:
-        result = db.execute(text(sql))
-    
-    rows = result.fetchall()
-    columns = list(result.keys())
+        result = db.execute(
+            statement,
+            query_params or {},
+            execution_options={"stream_results": True, "max_row_buffer": min(max(limit, 100), 1000)}
+        )
+        columns = list(result.keys())
+        try:
+            rows = list(islice(result, offset, offset + limit))
+        finally:
+            result.close()
     
     return rows, columns
 
 
+def _to_float(val: Any) -> Any:
+    """数值类型（decimal等）转换为float，无法转换时转为字符串"""
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return str(val)
+
+
+def _decode_bytes(val: bytes) -> str:
+    """bytes优先按UTF-8解码，失败时转换为base64"""
+    try:
+        return val.decode('utf-8')
+    except UnicodeDecodeError:
+        return base64.b64encode(val).decode('utf-8')
+
+
+def _ensure_serializable(val: Any) -> Any:
+    """其他类型：可JSON序列化时直接使用，否则转换为字符串"""
+    try:
+        json.dumps(val)
+        return val
+    except (TypeError, ValueError):
+        return str(val)
+
+
+def _build_converter(value_type: type) -> Optional[Callable[[Any], Any]]:
+    """根据值类型选择转换函数，返回None表示原样使用"""
+    if value_type is type(None) or value_type is str:
+        return None
+    # 处理datetime类型
+    if hasattr(value_type, 'isoformat'):
+        return lambda val: val.isoformat()
+    # 处理UUID类型（PostgreSQL等）
+    if 'UUID' in str(value_type):
+        return str
+    # 处理decimal等数值类型
+    if hasattr(value_type, '__float__'):
+        return _to_float
+    # 处理bytes类型
+    if issubclass(value_type, bytes):
+        return _decode_bytes
+    return _ensure_serializable
+
+
+# 值类型 -> 转换函数缓存（每种类型只判断一次）
+_VALUE_CONVERTERS: Dict[type, Optional[Callable[[Any], Any]]] = {}
+
+
+def _get_converter(value_type: type) -> Optional[Callable[[Any], Any]]:
+    """获取值类型对应的转换函数（带缓存）"""
+    try:
+        return _VALUE_CONVERTERS[value_type]
+    except KeyError:
+        converter = _VALUE_CONVERTERS[value_type] = _build_converter(value_type)
+        return converter
+
+
+def _convert_value(val: Any) -> Any:
+    """按值的实际类型转换（列的值类型与第一行不一致时使用，如NULL）"""
+    converter = _get_converter(type(val))
+    return val if converter is None else converter(val)
+
+
+@lru_cache(maxsize=256)
+def _get_row_builder(columns: Tuple[str, ...], column_types: Tuple[type, ...]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    为一组列名和列值类型生成行转换函数
+    
+    生成的函数直接解包行并构建字典，每列的转换函数在生成时确定，
+    逐行只做一次类型比较，类型不一致时回退到按值类型转换
+    """
+    namespace: Dict[str, Any] = {"_convert_value": _convert_value}
+    names = []
+    items = []
+    for index, (column, column_type) in enumerate(zip(columns, column_types)):
+        var = f"v{index}"
+        names.append(var)
+        namespace[f"_k{index}"] = column
+        namespace[f"_t{index}"] = column_type
+        converter = _get_converter(column_type)
+        if converter is None:
+            value_expr = var
+        else:
+            namespace[f"_c{index}"] = converter
+            value_expr = f"_c{index}({var})"
+        items.append(f"_k{index}: ({value_expr} if type({var}) is _t{index} else _convert_value({var}))")
+    
+    source = (
+        "def build_row(row):\n"
+        f"    {', '.join(names)}, = row\n"
+        f"    return {{{', '.join(items)}}}\n"
+    )
+    exec(source, namespace)
+    return namespace["build_row"]
+
+
 def convert_rows_to_dicts(
     rows: List[Any],
     columns: List[str]
@@ -102,6 +243,9 @@ def convert_rows_to_dicts(
     """
     将查询结果行转换为字典列表（公共函数）
     
+    按第一行各列的值类型生成专用的行转换函数（按列名和值类型缓存），
+    逐行只在值类型与该列不一致时（如NULL）重新查找转换函数
+    
     Args:
         rows: 查询结果行
         columns: 列名列表
@@ -109,44 +253,8 @@ def convert_rows_to_dicts(
     Returns:
         字典列表
     """
-    data = []
-    for row in rows:
-        row_dict = {}
-        for col, val in zip(columns, row):
-            # 处理None
-            if val is None:
-                row_dict[col] = None
-            # 处理datetime类型
-            elif hasattr(val, 'isoformat'):
-                row_dict[col] = val.isoformat()
-            # 处理UUID类型（PostgreSQL等）
-            elif hasattr(val, '__class__') and 'UUID' in str(type(val)):
-                row_dict[col] = str(val)
-            # 处理decimal类型
-            elif hasattr(val, '__float__'):
-                try:
-                    row_dict[col] = float(val)
-                except (ValueError, TypeError):
-                    row_dict[col] = str(val)
-            # 处理bytes类型
-            elif isinstance(val, bytes):
-                try:
-                    # 尝试解码为UTF-8字符串
-                    row_dict[col] = val.decode('utf-8')
-                except:
-                    # 如果解码失败，转换为base64
-                    import base64
-                    row_dict[col] = base64.b64encode(val).decode('utf-8')
-            # 其他类型转换为字符串（确保可序列化）
-            else:
-                try:
-                    # 尝试直接使用（测试是否可序列化）
-                    import json
-                    json.dumps(val)  # 测试是否可序列化
-                    row_dict[col] = val
-                except (TypeError, ValueError):
-                    # 如果不可序列化，转换为字符串
-                    row_dict[col] = str(val)
-        data.append(row_dict)
+    if not rows or not columns:
+        return [{} for _ in rows] if rows else []
     
-    return data
+    build_row = _get_row_builder(tuple(columns), tuple(type(val) for val in rows[0]))
+    return [build_row(row) for row in rows]
@@ -3,10 +3,13 @@
 """
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from sqlalchemy.exc import NoResultFound
 from loguru import logger
+import anyio
 import sys
 from pathlib import Path
 
@@ -97,6 +100,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    # 使用orjson序列化响应，datetime等类型由orjson原生处理
+    default_response_class=ORJSONResponse,
     contact={
         "name": "技术支持",
         "url": "https://github.com/your-repo/table_to_service/issues"
@@ -115,6 +120,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 响应压缩（接口配置列表、API文档、表结构等大体积JSON响应；小响应不压缩）
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL
+)
+
 # 全局异常处理
 @app.exception_handler(BaseAPIException)
 async def api_exception_handler(request: Request, exc: BaseAPIException):
@@ -146,6 +158,32 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     )
 
 
+# NoResultFound本身不携带资源类型，按路由前缀给出具体的提示信息
+_NOT_FOUND_MESSAGES = {
+    "/api/v1/database-configs": "数据库配置不存在",
+    "/api/v1/interface-configs": "接口配置不存在",
+}
+
+
+@app.exception_handler(NoResultFound)
+async def no_result_found_handler(request: Request, exc: NoResultFound):
+    """按ID查询单条记录（Query.one()）未命中时统一返回404"""
+    path = request.url.path
+    message = next(
+        (msg for prefix, msg in _NOT_FOUND_MESSAGES.items() if path.startswith(prefix)),
+        "资源不存在或无权访问"
+    )
+    logger.warning("资源不存在: {} {}", request.method, path)
+    return JSONResponse(
+        status_code=404,
+        content={
+            "success": False,
+            "message": message,
+            "detail": str(exc) if settings.DEBUG else message
+        }
+    )
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """请求验证异常处理"""
@@ -209,6 +247,9 @@ async def startup_event():
     logger.info("智能问数+服务启动中...")
     logger.info("=" * 50)
     
+    # 调整线程池大小：同步（def）路由和run_in_threadpool中的数据库调用都在该线程池中执行
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    
     # 测试本地数据库连接
     if test_local_connection():
         logger.info("本地数据库连接成功")
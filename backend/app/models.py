@@ -1,7 +1,7 @@
 """
 数据模型定义
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -128,6 +128,16 @@ class InterfaceConfig(Base):
     database_config = relationship("DatabaseConfig", back_populates="interface_configs")
     parameters = relationship("InterfaceParameter", back_populates="interface_config", cascade="all, delete-orphan")
     headers = relationship("InterfaceHeader", back_populates="interface_config", cascade="all, delete-orphan")
+    
+    # 索引：列表查询按用户、状态过滤并按创建时间倒序；
+    # PostgreSQL下另建只包含已启用接口的部分索引，覆盖最常见的 enabled=true 查询（MySQL不支持部分索引，不创建）
+    __table_args__ = (
+        Index("ix_ic_user_status_created", "user_id", "status", created_at.desc()),
+        Index(
+            "ix_ic_user_created_active", "user_id", created_at.desc(),
+            postgresql_where=text("status = 'active'")
+        ).ddl_if(dialect="postgresql"),
+    )
 
 
 class InterfaceParameter(Base):
@@ -167,6 +177,26 @@ class InterfaceHeader(Base):
     interface_config = relationship("InterfaceConfig", back_populates="headers")
 
 
+class AuditLog(Base):
+    """接口审计日志模型"""
+    __tablename__ = "audit_logs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    interface_id = Column(Integer, index=True, nullable=True, comment="接口配置ID")
+    user_id = Column(Integer, nullable=True, comment="用户ID")
+    client_ip = Column(String(64), nullable=True, comment="客户端IP")
+    action = Column(String(50), nullable=False, comment="操作类型")
+    resource_type = Column(String(50), nullable=True, comment="资源类型")
+    resource_id = Column(Integer, nullable=True, comment="资源ID")
+    details = Column(Text, nullable=True, comment="操作详情（JSON格式）")
+    sql_statement = Column(Text, nullable=True, comment="SQL语句（已脱敏）")
+    execution_time = Column(Float, nullable=True, comment="执行时间（秒）")
+    row_count = Column(Integer, nullable=True, comment="返回行数")
+    success = Column(Boolean, default=True, comment="是否成功")
+    error_message = Column(String(500), nullable=True, comment="错误信息")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
+
+
 # ==================== 智能问数功能相关模型 ====================
 
 class AIModelConfig(Base):
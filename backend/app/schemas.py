@@ -39,19 +39,6 @@ class ResponseModel(BaseModel):
     pagination: Optional[Dict[str, Any]] = None  # 分页信息
 
 
-class PaginationParams(BaseModel):
-    """分页参数"""
-    page: int = Field(1, ge=1, description="页码，从1开始")
-    page_size: int = Field(10, ge=1, le=100, description="每页数量，最大100")
-    order_by: Optional[str] = Field(None, description="排序字段")
-    order_desc: bool = Field(False, description="是否降序")
-
-
-class FilterParams(BaseModel):
-    """过滤参数"""
-    filters: Optional[Dict[str, Any]] = Field(None, description="过滤条件，格式: {字段名: 值}")
-
-
 class ListResponse(BaseModel):
     """列表响应模型"""
     items: List[Dict[str, Any]]